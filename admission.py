@@ -0,0 +1,222 @@
+"""
+Admission control and backpressure for the analysis service.
+
+An AdmissionController lets a fixed number of requests run at once and
+queues a bounded number more. Requests beyond the queue, or queued for
+longer than the queue timeout, are shed so the caller can answer with a
+cheap degraded result instead of adding to everyone's latency. Each client
+can also be held to a token-bucket rate limit.
+
+The controller is meant for a single asyncio event loop and isn't
+thread-safe.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from metrics import REGISTRY
+
+WAIT_SECONDS = REGISTRY.histogram('password_admission_wait_seconds', "Time requests waited for an analysis slot")
+
+class RateLimited(Exception):
+    """The client has used up its token bucket."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Rate limit exceeded, retry in {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+class Overloaded(Exception):
+    """The queue is full or the wait for a slot timed out."""
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate.
+
+    Args:
+        rate (float): Tokens added per second
+        burst (float): Bucket capacity
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost=1.0):
+        """
+        Takes tokens if enough are available.
+
+        Args:
+            cost (float): Tokens to take
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise seconds until they will be
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # A request costing more than the whole bucket waits for a full bucket
+        # and then puts it into debt, so batches can't beat the average rate
+        needed = min(cost, self.burst)
+        if self.tokens >= needed:
+            self.tokens -= cost
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded FIFO queue and per-client rate limits.
+
+    Args:
+        max_concurrent (int): Requests allowed to run at once
+        max_queue (int): Requests allowed to wait for a slot; more are shed
+        queue_timeout (float): Seconds a request may wait before being shed,
+            or None to wait indefinitely
+        rate (float): Per-client requests per second, or None for no limit
+        burst (float): Per-client bucket size (defaults to rate, minimum 1)
+        max_clients (int): Token buckets kept before the least recently seen is dropped
+        wait_samples (int): Recent wait times kept for percentiles
+    """
+
+    def __init__(self, max_concurrent=8, max_queue=64, queue_timeout=1.0, rate=None, burst=None,
+                 max_clients=10000, wait_samples=1024):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 0.0)
+        self.max_clients = max_clients
+        self.active = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._waiters = deque()
+        self._buckets = OrderedDict()
+        self._waits = deque(maxlen=wait_samples)
+
+    @property
+    def queue_depth(self):
+        """Number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def check_rate(self, client, cost=1.0):
+        """
+        Charges a client's token bucket.
+
+        Args:
+            client (str): Client identifier
+            cost (float): Tokens the request costs
+
+        Raises:
+            RateLimited: The client is over its rate limit
+        """
+        if self.rate is None:
+            return
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+
+        retry_after = bucket.take(cost)
+        if retry_after:
+            self.rate_limited += 1
+            raise RateLimited(retry_after)
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Holds a slot for the enclosed block. Rate limits are checked
+        separately with check_rate().
+
+        Raises:
+            Overloaded: The queue is full or the wait timed out
+        """
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self):
+        start = time.monotonic()
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+        else:
+            if len(self._waiters) >= self.max_queue:
+                self.shed += 1
+                raise Overloaded("Analysis queue is full")
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._abandon(waiter)
+                self.shed += 1
+                self.timed_out += 1
+                raise Overloaded("Timed out waiting for an analysis slot") from None
+            except BaseException:
+                self._abandon(waiter)
+                raise
+
+        wait = time.monotonic() - start
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self._waits.append(wait)
+        WAIT_SECONDS.observe(wait)
+
+    def _abandon(self, waiter):
+        """Drop a waiter that gave up, passing on a slot it was already handed."""
+        if waiter.done() and not waiter.cancelled():
+            self._release()
+        else:
+            waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def _release(self):
+        # Hand the slot straight to the oldest waiter so it can't be overtaken
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self):
+        """
+        Returns admission counters and recent wait-time percentiles.
+
+        Returns:
+            dict: Active and queued requests, admissions, rejections and wait times
+        """
+        waits = sorted(self._waits)
+
+        def percentile(fraction):
+            return waits[min(len(waits) - 1, int(fraction * len(waits)))] if waits else 0.0
+
+        return {
+            'active': self.active,
+            'queue_depth': len(self._waiters),
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue,
+            'admitted': self.admitted,
+            'rate_limited': self.rate_limited,
+            'shed': self.shed,
+            'timed_out': self.timed_out,
+            'wait_seconds_total': self.total_wait,
+            'wait_seconds_max': self.max_wait,
+            'wait_seconds_p50': percentile(0.5),
+            'wait_seconds_p99': percentile(0.99)
+        }
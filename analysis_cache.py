@@ -0,0 +1,140 @@
+"""
+Bounded LRU/TTL cache for password analysis results.
+
+Entries are keyed by an HMAC of the password under a random per-process
+secret, so the cache never holds plaintext passwords and its keys are
+useless outside the process that created them.
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+class AnalysisCache:
+    """
+    Least-recently-used cache of analysis results with optional expiry.
+
+    Args:
+        max_size (int): Maximum number of results kept before the least
+            recently used one is evicted. 0 disables caching.
+        ttl (float): Seconds a result stays valid, or None to never expire
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._secret = secrets.token_bytes(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, password, variant=None):
+        """
+        Returns the cache key for a password.
+
+        Args:
+            password (str): The password to key
+            variant (str): Namespace for results computed differently, such
+                as the estimator backend, or None for the default
+
+        Returns:
+            bytes: HMAC-SHA256 of the password under the per-process secret
+        """
+        mac = hmac.new(self._secret, digestmod=hashlib.sha256)
+        if variant is not None:
+            mac.update(variant.encode('utf-8') + b'\x00')
+        mac.update(password.encode('utf-8', 'surrogatepass'))
+        return mac.digest()
+
+    def get(self, password, variant=None):
+        """
+        Looks up a cached result.
+
+        Args:
+            password (str): The password to look up
+            variant (str): Namespace the result was stored under
+
+        Returns:
+            dict: The cached analysis, or None on a miss
+        """
+        key = self.key(password, variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, analysis = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return analysis
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, password, analysis, variant=None):
+        """
+        Stores a result, evicting the least recently used entries if full.
+
+        Args:
+            password (str): The analyzed password
+            analysis (dict): Its analysis result
+            variant (str): Namespace to store the result under
+        """
+        if self.max_size <= 0:
+            return
+        key = self.key(password, variant)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_analyze(self, password, analyze, variant=None):
+        """
+        Returns the cached result for a password, computing it on a miss.
+
+        Args:
+            password (str): The password to analyze
+            analyze (callable): Function used to analyze uncached passwords
+            variant (str): Namespace the result is cached under
+
+        Returns:
+            dict: Analysis results. Cached dicts are shared, so treat them as read-only.
+        """
+        analysis = self.get(password, variant)
+        if analysis is None:
+            analysis = analyze(password)
+            self.put(password, analysis, variant)
+        return analysis
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns cache counters.
+
+        Returns:
+            dict: Size, capacity, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
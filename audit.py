@@ -0,0 +1,229 @@
+"""
+Command-line auditor for large password files.
+
+Reads newline-delimited passwords from a file or stdin, analyzes them as a
+stream and writes one result per line as JSONL or CSV. Progress and
+throughput are reported on stderr.
+
+Usage:
+    python audit.py passwords.txt --format csv --output results.csv
+    cat passwords.txt | python audit.py --workers 8 > results.jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from analysis_cache import AnalysisCache
+from breach_check import BREACH_BLOOM_ENV, BREACH_FILE_ENV, configure_bloom_filter, configure_breach_index
+from dictionary_store import DICTIONARY_STORE_ENV
+from estimators import EXACT_LENGTH_ENV, TIME_BUDGET_ENV, ZXCVBN_WINDOW, available_backends, configure_budget
+from metrics import REGISTRY, write_metrics_periodically
+from password_analyzer import iter_analyze_passwords
+from pattern_matcher import BANNED_WORDS_ENV, configure_banned_words
+from profiling import profile
+
+CSV_FIELDS = [
+    'line',
+    'score',
+    'crack_time_seconds',
+    'crack_time_display',
+    'feedback',
+    'warnings',
+    'suggestions',
+    'failed_checks',
+    'error'
+]
+
+def read_passwords(stream):
+    """
+    Yields passwords from a newline-delimited text stream, one line at a time.
+
+    Args:
+        stream (file): Text stream to read from
+
+    Yields:
+        str: Each line with its line ending removed. Blank lines are kept, as
+            empty passwords, so results line up with the input's line numbers.
+    """
+    for line in stream:
+        yield line.rstrip('\r\n')
+
+def to_csv_row(line_number, analysis):
+    """
+    Flattens an analysis dict into a CSV row.
+
+    Args:
+        line_number (int): 1-based line number of the password in the input
+        analysis (dict): Result of analyze_password
+
+    Returns:
+        dict: Row keyed by CSV_FIELDS. Only 'line' and 'error' are set for a
+            password whose analysis failed.
+    """
+    if 'error' in analysis:
+        return {'line': line_number, 'error': analysis['error']}
+    failed_checks = [name for name, details in analysis['strength_details'].items() if not details['pass']]
+    return {
+        'line': line_number,
+        'score': analysis['score'],
+        'crack_time_seconds': analysis['crack_time_seconds'],
+        'crack_time_display': analysis['crack_time_display'],
+        'feedback': analysis['feedback'],
+        'warnings': analysis['warnings'],
+        'suggestions': '; '.join(analysis['suggestions']),
+        'failed_checks': '; '.join(failed_checks)
+    }
+
+class ProgressReporter:
+    """Periodically writes processed counts and throughput to stderr."""
+
+    def __init__(self, stream=sys.stderr, interval=2.0):
+        self.stream = stream
+        self.interval = interval
+        self.count = 0
+        self.errors = 0
+        self.start = time.monotonic()
+        self.last_report = self.start
+
+    def update(self, count=1, errors=0):
+        self.count += count
+        self.errors += errors
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now=None, final=False):
+        now = now or time.monotonic()
+        elapsed = max(now - self.start, 1e-9)
+        prefix = "Done" if final else "Processed"
+        failed = f", {self.errors:,} failed" if self.errors else ""
+        self.stream.write(f"{prefix}: {self.count:,} passwords in {elapsed:.1f}s ({self.count / elapsed:,.0f} passwords/sec){failed}\n")
+        self.stream.flush()
+
+def audit(input_stream, output_stream, output_format='jsonl', workers=None, chunksize=256, progress=None, cache=None, backend=None, tier_counts=None):
+    """
+    Streams passwords from input_stream through the analyzer into output_stream.
+
+    Args:
+        input_stream (file): Newline-delimited passwords
+        output_stream (file): Destination for JSONL or CSV results
+        output_format (str): Either 'jsonl' or 'csv'
+        workers (int): Number of worker processes
+        chunksize (int): Number of passwords sent to a worker at a time
+        progress (ProgressReporter): Optional progress reporter
+        cache (AnalysisCache): Optional cache used to skip repeated passwords
+        backend (str): Estimator backend (defaults to PASSWORD_ESTIMATOR or zxcvbn)
+        tier_counts (Counter): Optional counter of the tier that settled each
+            password, filled in by the tiered backend
+
+    A password whose analysis fails is written as an error record for its
+    line, and the run carries on.
+
+    Returns:
+        int: Number of passwords processed
+    """
+    if output_format == 'csv':
+        writer = csv.DictWriter(output_stream, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        def write(line_number, analysis):
+            writer.writerow(to_csv_row(line_number, analysis))
+    else:
+        def write(line_number, analysis):
+            output_stream.write(json.dumps({'line': line_number, **analysis}, default=float) + "\n")
+
+    passwords = read_passwords(input_stream)
+    results = iter_analyze_passwords(passwords, workers=workers, chunksize=chunksize, cache=cache, backend=backend)
+
+    count = 0
+    for count, analysis in enumerate(results, start=1):
+        write(count, analysis)
+        if tier_counts is not None and 'tier' in analysis:
+            tier_counts[analysis['tier']] += 1
+        if progress:
+            progress.update(errors=int('error' in analysis))
+
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit a newline-delimited password file.")
+    parser.add_argument('input', nargs='?', default='-', help="Password file to read (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="File to write results to (default: stdout)")
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], default='jsonl', help="Output format")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=256, help="Passwords sent to a worker at a time")
+    parser.add_argument('--cache-size', type=int, default=100000, help="Distinct results kept to skip repeated passwords (0 disables)")
+    parser.add_argument('--banned-words', action='append', default=[], metavar='FILE', help="Extra word list of banned terms (repeatable)")
+    parser.add_argument('--breach-file', metavar='FILE', help="Sorted SHA-1 hash file of breached passwords")
+    parser.add_argument('--breach-bloom', metavar='FILE', help="Bloom filter built from the breach file (see bloom_filter.py)")
+    parser.add_argument('--dictionary-store', metavar='FILE', help="Compiled dictionary store shared by all workers (see dictionary_store.py)")
+    parser.add_argument('--backend', choices=available_backends(), help="Strength estimator (default: PASSWORD_ESTIMATOR or zxcvbn)")
+    parser.add_argument('--exact-length', type=int, metavar='N', help=f"Longest password analyzed exactly; longer ones are approximated (default: {ZXCVBN_WINDOW})")
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS', help="Time spent approximating each longer password (default: 0.25)")
+    parser.add_argument('--metrics', metavar='FILE', help="Write Prometheus metrics to a file, refreshed every 15s and at the end")
+    parser.add_argument('--timings', metavar='FILE', help="Write aggregated per-stage timings to a JSON file")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Don't report progress on stderr")
+    args = parser.parse_args(argv)
+
+    if args.banned_words:
+        # Exported so that worker processes build the same matcher
+        os.environ[BANNED_WORDS_ENV] = os.pathsep.join(args.banned_words)
+        configure_banned_words(args.banned_words)
+    if args.dictionary_store:
+        # Read when each process first loads zxcvbn
+        os.environ[DICTIONARY_STORE_ENV] = args.dictionary_store
+    if args.exact_length is not None or args.time_budget is not None:
+        if args.exact_length is not None:
+            os.environ[EXACT_LENGTH_ENV] = str(args.exact_length)
+        if args.time_budget is not None:
+            os.environ[TIME_BUDGET_ENV] = str(args.time_budget)
+        configure_budget(args.exact_length, args.time_budget)
+    if args.breach_file:
+        os.environ[BREACH_FILE_ENV] = args.breach_file
+        configure_breach_index(args.breach_file)
+    if args.breach_bloom:
+        os.environ[BREACH_BLOOM_ENV] = args.breach_bloom
+        configure_bloom_filter(args.breach_bloom)
+
+    input_stream = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8', errors='replace', newline='')
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    progress = None if args.quiet else ProgressReporter()
+    cache = AnalysisCache(max_size=args.cache_size) if args.cache_size > 0 else None
+    tier_counts = Counter()
+    if cache is not None:
+        REGISTRY.register_cache('audit', cache)
+    stop_metrics = write_metrics_periodically(args.metrics) if args.metrics else None
+
+    try:
+        if args.timings:
+            with profile() as collector:
+                audit(input_stream, output_stream, args.format, args.workers, args.chunksize, progress, cache, args.backend, tier_counts)
+            collector.dump(args.timings)
+        else:
+            audit(input_stream, output_stream, args.format, args.workers, args.chunksize, progress, cache, args.backend, tier_counts)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+        if stop_metrics is not None:
+            stop_metrics.set()
+            REGISTRY.write(args.metrics)
+
+    if progress:
+        progress.report(final=True)
+        if cache is not None:
+            stats = cache.stats()
+            sys.stderr.write(f"Cache: {stats['hits']:,} hits, {stats['misses']:,} misses ({stats['hit_rate']:.1%} hit rate)\n")
+        if tier_counts:
+            tiers = ', '.join(f"{tier} {count:,}" for tier, count in tier_counts.most_common())
+            sys.stderr.write(f"Tiers: {tiers}\n")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
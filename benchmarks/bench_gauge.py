@@ -0,0 +1,87 @@
+"""
+Strength gauge: prebuilt SVG versus a Plotly figure built per check.
+
+For every score, times what the page did on each check before (build the
+go.Indicator figure, lay it out and serialize it to the JSON st.plotly_chart
+sends) against looking up the prebuilt SVG, and compares the payload sizes.
+The Plotly path also makes the browser load plotly.js on first use; that
+download isn't included here.
+
+Usage:
+    python benchmarks/bench_gauge.py [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gauge import MAX_SCORE, gauge_html
+from utils import get_emoji_rating, get_strength_color
+
+def plotly_gauge(score):
+    """The gauge as main.py used to build it, serialized for the browser."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [0, 4], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': get_strength_color(score)},
+            'steps': [
+                {'range': [0, 1], 'color': "#FF4B4B"},
+                {'range': [1, 2], 'color': "#FF4B4B"},
+                {'range': [2, 3], 'color': "#FFA500"},
+                {'range': [3, 4], 'color': "#00CC66"}
+            ],
+        },
+        title={'text': f"Password Strength: {get_emoji_rating(score)}"}
+    ))
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=50, b=20),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font={"color": "#E0E0E0"}
+    )
+    return fig.to_json()
+
+def time_render(render, repeat):
+    """Median seconds per call over every score."""
+    samples = []
+    for _ in range(repeat):
+        for score in range(MAX_SCORE + 1):
+            start = time.perf_counter()
+            render(score)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the SVG gauge with a per-check Plotly figure.")
+    parser.add_argument('--repeat', type=int, default=200, help="Renders per score")
+    args = parser.parse_args(argv)
+
+    # Imports and first builds are one-off costs, so keep them out of the timings
+    start = time.perf_counter()
+    plotly_gauge(0)
+    plotly_first = time.perf_counter() - start
+
+    plotly_size = statistics.fmean(len(plotly_gauge(score).encode('utf-8')) for score in range(MAX_SCORE + 1))
+    svg_size = statistics.fmean(len(gauge_html(score).encode('utf-8')) for score in range(MAX_SCORE + 1))
+    plotly_time = time_render(plotly_gauge, args.repeat)
+    svg_time = time_render(gauge_html, args.repeat)
+
+    print(f"{'gauge':<22}{'render (us)':>14}{'payload (bytes)':>18}")
+    print(f"{'plotly per check':<22}{plotly_time * 1e6:>14.1f}{plotly_size:>18,.0f}")
+    print(f"{'prebuilt svg':<22}{svg_time * 1e6:>14.1f}{svg_size:>18,.0f}")
+    print(f"speedup {plotly_time / svg_time:,.0f}x, payload {svg_size / plotly_size:.1%} of plotly's")
+    print(f"first plotly figure (import included): {plotly_first * 1000:.1f} ms")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
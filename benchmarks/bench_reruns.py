@@ -0,0 +1,326 @@
+"""
+Per-interaction cost of the Streamlit page, measured against a live server.
+
+Starts `streamlit run main.py` headless on a free port and drives it over
+the same websocket protocol the browser uses. For every rerun it records the
+messages and bytes the server sends and the server CPU time spent.
+
+Typing: a password is typed one character at a time, once as whole-script
+reruns (what every edit of the input used to cost) and once as reruns of just
+the input fragment. A one-widget app is measured the same way to show
+Streamlit's own per-rerun floor.
+
+Navigation: the sidebar sections are clicked through, which reruns the whole
+script, once with the stylesheet inlined into the page and once linked as a
+static asset. The first page load is reported separately: reruns already
+send large repeated messages by reference, so the inline stylesheet mostly
+costs on every new session and page reload.
+
+Check: passwords are typed and checked with the Check Strength button. Each
+click counts everything it causes, the input fragment's run and the full
+rerun that shows the results. The delta column is the number of elements
+sent to the browser.
+
+--app measures another copy of main.py, e.g. a checkout of an older commit.
+
+The run fails if a first page load or a full rerun with the static stylesheet
+sends more bytes on average than --max-load-bytes or --max-rerun-bytes. The
+defaults leave headroom over the current page (about 6.4 KB and 5.4 KB) but
+catch regressions such as the stylesheet being inlined again (about 20 KB).
+
+Like the browser, the client reports the hashes of cacheable messages it
+has already received, so the server may send references instead of repeats.
+Server CPU time is read from /proc and is only reported on Linux.
+
+Usage:
+    python benchmarks/bench_reruns.py [--password TEXT] [--repeat N]
+    python benchmarks/bench_reruns.py --max-load-bytes 0 --max-rerun-bytes 0  # no limits
+    python benchmarks/bench_reruns.py --app /tmp/old-checkout/main.py
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INPUT_KEY = 'password_input'
+CHECK_KEY = 'check_strength'
+
+# Time given to the analyzer's background warm-up before checks are measured,
+# so every measured check finishes inline instead of being polled for
+WARMUP_SECONDS = 3.0
+
+# Default byte limits for the static-stylesheet page, see the module docstring
+MAX_LOAD_BYTES = 10000
+MAX_RERUN_BYTES = 8000
+
+# Sidebar buttons clicked through in the navigation scenario
+SECTION_KEYS = ['btn_history', 'btn_facts', 'btn_funny', 'btn_security_tips']
+
+# Smallest app with the same input, for the framework's per-rerun overhead
+FLOOR_APP = """
+import streamlit as st
+
+@st.fragment
+def panel():
+    st.text_input("Password", type="password", key="password_input")
+
+panel()
+"""
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def spawn_app(port, script=os.path.join(ROOT, 'main.py'), static=True):
+    """Starts a script under `streamlit run` in a scratch directory."""
+    command = [
+        sys.executable, '-m', 'streamlit', 'run', script,
+        '--server.headless', 'true', '--server.port', str(port),
+        '--server.enableStaticServing', str(static).lower(),
+        '--browser.gatherUsageStats', 'false'
+    ]
+    return subprocess.Popen(command, cwd=tempfile.mkdtemp(prefix='pw-reruns-'),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def stop_app(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def cpu_seconds(pid):
+    """User plus system CPU time of a process, or None where /proc is missing."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+class AppClient:
+    """
+    Minimal browser stand-in for one Streamlit session.
+
+    Args:
+        websocket: Open connection to the app's /_stcore/stream endpoint
+        pid (int): Server process id, for CPU accounting
+    """
+
+    def __init__(self, websocket, pid):
+        self.websocket = websocket
+        self.pid = pid
+        self.widgets = {}
+        self.fragments = {}
+        self.cached = set()
+
+    @classmethod
+    async def connect(cls, port, pid, timeout=60.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                websocket = await websockets.connect(
+                    f'ws://127.0.0.1:{port}/_stcore/stream', subprotocols=['streamlit'],
+                    origin=f'http://127.0.0.1:{port}', max_size=None
+                )
+                return cls(websocket, pid)
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+    async def rerun(self, values=None, fragment_key=None):
+        """
+        Requests a rerun and reads messages until the run finishes.
+
+        Args:
+            values (dict): Widget values by user key, e.g. {'password_input': 'abc'}
+            fragment_key (str): Rerun only the fragment holding this widget
+
+        Returns:
+            dict: Messages, deltas and bytes received, server CPU and wall time
+        """
+        message = BackMsg()
+        state = message.rerun_script
+        state.query_string = ''
+        state.cached_message_hashes.extend(sorted(self.cached))
+        for key, value in (values or {}).items():
+            widget = state.widget_states.widgets.add()
+            widget.id = self.widgets[key]
+            if isinstance(value, bool):
+                widget.trigger_value = value
+            else:
+                widget.string_value = value
+        if fragment_key is not None:
+            state.fragment_id = self.fragments[fragment_key]
+
+        cpu = cpu_seconds(self.pid)
+        start = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+
+        stats = {'messages': 0, 'deltas': 0, 'bytes': 0}
+        while True:
+            data = await self.websocket.recv()
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            stats['messages'] += 1
+            stats['bytes'] += len(data)
+            kind = forward.WhichOneof('type')
+            if forward.metadata.cacheable:
+                self.cached.add(forward.hash)
+            if kind == 'delta':
+                stats['deltas'] += 1
+                self._register(forward.delta)
+            elif kind == 'script_finished':
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+
+        stats['wall'] = time.perf_counter() - start
+        end_cpu = cpu_seconds(self.pid)
+        stats['cpu'] = end_cpu - cpu if cpu is not None and end_cpu is not None else None
+        return stats
+
+    def _register(self, delta):
+        """Remember widget ids and their fragments by the widgets' user keys."""
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        element = delta.new_element
+        widget = getattr(element, element.WhichOneof('type'))
+        widget_id = getattr(widget, 'id', '')
+        if widget_id.startswith('$$ID-'):
+            key = widget_id.split('-', 2)[2]
+            self.widgets[key] = widget_id
+            if delta.fragment_id:
+                self.fragments[key] = delta.fragment_id
+
+    async def close(self):
+        await self.websocket.close()
+
+async def typing(client, password, fragment):
+    """Types a password one character at a time; returns per-keystroke stats."""
+    return [
+        await client.rerun({INPUT_KEY: password[:end]}, INPUT_KEY if fragment else None)
+        for end in range(1, len(password) + 1)
+    ]
+
+async def navigation(client, rounds=3):
+    """Clicks through the sidebar sections; returns per-click stats."""
+    return [await client.rerun({key: True}) for _ in range(rounds) for key in SECTION_KEYS]
+
+async def checking(client, password, rounds=5):
+    """Types and checks distinct passwords; returns per-click stats."""
+    await client.rerun({INPUT_KEY: password}, INPUT_KEY)
+    await client.rerun({INPUT_KEY: password, CHECK_KEY: True}, INPUT_KEY)
+    await asyncio.sleep(WARMUP_SECONDS)
+
+    costs = []
+    for round in range(rounds):
+        value = f'{password}{round}'
+        await client.rerun({INPUT_KEY: value}, INPUT_KEY)
+        costs.append(await client.rerun({INPUT_KEY: value, CHECK_KEY: True}, INPUT_KEY))
+    return costs
+
+async def session_costs(port, pid, scenario):
+    """Opens a session and runs a scenario; returns the first load's and the reruns' stats."""
+    client = await AppClient.connect(port, pid)
+    try:
+        first = await client.rerun()
+        return first, await scenario(client)
+    finally:
+        await client.close()
+
+def summarize(costs):
+    # CPU time is read in clock ticks, so only its mean is meaningful
+    def mean(name):
+        values = [cost[name] for cost in costs if cost[name] is not None]
+        return statistics.fmean(values) if values else float('nan')
+
+    return {name: mean(name) for name in ('messages', 'deltas', 'bytes', 'cpu', 'wall')}
+
+def measure(scenario, repeat, script=os.path.join(ROOT, 'main.py'), static=True):
+    """
+    Runs a scenario in fresh sessions of a newly started app.
+
+    Returns:
+        tuple: Mean stats of the first page loads and of the reruns
+    """
+    port = free_port()
+    process = spawn_app(port, script, static)
+    try:
+        firsts, costs = [], []
+        for _ in range(repeat):
+            first, reruns = asyncio.run(session_costs(port, process.pid, scenario))
+            firsts.append(first)
+            costs += reruns
+        return summarize(firsts), summarize(costs)
+    finally:
+        stop_app(process)
+
+def print_row(label, summary):
+    print(f"{label:<28}{summary['messages']:>10.0f}{summary['deltas']:>8.0f}{summary['bytes']:>12,.0f}"
+          f"{summary['cpu'] * 1000:>12.1f}{summary['wall'] * 1000:>12.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure server cost per keystroke of the Streamlit page.")
+    parser.add_argument('--password', default='Tr0ub4dor&3xyz', help="Text typed into the input")
+    parser.add_argument('--repeat', type=int, default=3, help="Sessions per scenario")
+    parser.add_argument('--app', default=os.path.join(ROOT, 'main.py'), help="Streamlit script to measure")
+    parser.add_argument('--max-load-bytes', type=int, default=MAX_LOAD_BYTES,
+                        help="Exit non-zero if a first page load with the static stylesheet sends more bytes than this "
+                             f"on average (default: {MAX_LOAD_BYTES}, 0 for no limit)")
+    parser.add_argument('--max-rerun-bytes', type=int, default=MAX_RERUN_BYTES,
+                        help="Exit non-zero if a full rerun with the static stylesheet sends more bytes than this "
+                             f"on average (default: {MAX_RERUN_BYTES}, 0 for no limit)")
+    args = parser.parse_args(argv)
+
+    floor_script = os.path.join(tempfile.mkdtemp(prefix='pw-floor-'), 'floor.py')
+    with open(floor_script, 'w') as f:
+        f.write(FLOOR_APP)
+
+    def typed(fragment):
+        return lambda client: typing(client, args.password, fragment)
+
+    header = f"{'messages':>10}{'deltas':>8}{'bytes':>12}{'cpu ms':>12}{'wall ms':>12}"
+    print(f"{'per keystroke (mean)':<28}{header}")
+    print_row('whole script', measure(typed(False), args.repeat, args.app)[1])
+    print_row('input fragment', measure(typed(True), args.repeat, args.app)[1])
+    print_row('floor (one-widget app)', measure(typed(True), args.repeat, floor_script)[1])
+
+    print()
+    print(f"{'per check click (mean)':<28}{header}")
+    print_row('check strength', measure(lambda client: checking(client, args.password), args.repeat, args.app)[1])
+
+    print()
+    print(f"{'per sidebar click (mean)':<28}{header}")
+    inline_first, inline = measure(navigation, args.repeat, args.app, static=False)
+    static_first, static = measure(navigation, args.repeat, args.app, static=True)
+    print_row('inline stylesheet', inline)
+    print_row('static stylesheet', static)
+    print()
+    print(f"{'first page load (mean)':<28}{header}")
+    print_row('inline stylesheet', inline_first)
+    print_row('static stylesheet', static_first)
+
+    failed = False
+    for label, summary, limit in [('first page load', static_first, args.max_load_bytes),
+                                  ('full rerun', static, args.max_rerun_bytes)]:
+        if limit and summary['bytes'] > limit:
+            print(f"FAIL: {label} sends {summary['bytes']:,.0f} bytes, limit {limit:,}")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
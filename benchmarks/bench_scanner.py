@@ -0,0 +1,78 @@
+"""
+Microbenchmark: single-pass scanner vs. the previous per-criterion checks.
+
+The "legacy" side reproduces the seven regex-based check_* passes and the
+four any(...) scans from the real-time feedback block in main.py. The
+"scanner" side runs the current check_* helpers over one shared scan plus
+the real-time flags derived from it.
+
+Usage:
+    python benchmarks/bench_scanner.py [--number N]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import password_analyzer
+from scanner import scan_password
+
+SAMPLES = {
+    'short': "passw0rd",
+    'mixed': "Tr0ub4dor&3xx",
+    'passphrase': "correct horse battery staple",
+    'long random': "kX9^p2!LmZ@vQ7#rT4$wY8%uI1&oP6*aS3",
+    'unicode': "pässwörd-Ünïcödé-٣٤٥"
+}
+
+def _detail(passed):
+    return {'pass': passed, 'message': ""}
+
+def legacy_checks(password):
+    lower_password = password.lower()
+    return (
+        _detail(len(password) >= 8),
+        _detail(bool(re.search(r'[A-Z]', password))),
+        _detail(bool(re.search(r'[a-z]', password))),
+        _detail(bool(re.search(r'\d', password))),
+        _detail(bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password))),
+        _detail(not any(seq in lower_password for seq in ['123', 'abc', 'qwerty', 'password', 'admin'])),
+        _detail(not re.search(r'(.)\1{2,}', password)),
+        any(c.isupper() for c in password),
+        any(c.islower() for c in password),
+        any(c.isdigit() for c in password),
+        any(not c.isalnum() for c in password)
+    )
+
+def scanner_checks(password):
+    scan = scan_password(password)
+    return (
+        password_analyzer.check_length(password, scan),
+        password_analyzer.check_uppercase(password, scan),
+        password_analyzer.check_lowercase(password, scan),
+        password_analyzer.check_numbers(password, scan),
+        password_analyzer.check_special_chars(password, scan),
+        password_analyzer.check_common_patterns(password, scan),
+        password_analyzer.check_repetition(password, scan),
+        scan.any_upper,
+        scan.any_lower,
+        scan.digits > 0,
+        scan.symbols > 0
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000, help="Iterations per sample")
+    args = parser.parse_args(argv)
+
+    print(f"{'sample':<14}{'legacy (us)':>14}{'scanner (us)':>14}{'speedup':>10}")
+    for name, password in SAMPLES.items():
+        legacy = timeit.timeit(lambda: legacy_checks(password), number=args.number) / args.number * 1e6
+        scanned = timeit.timeit(lambda: scanner_checks(password), number=args.number) / args.number * 1e6
+        print(f"{name:<14}{legacy:>14.2f}{scanned:>14.2f}{legacy / scanned:>9.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Import-time and first-paint report for the Streamlit page.
+
+Measures, each in a fresh interpreter:
+  * the cold import cost of every module main.py used to import eagerly
+  * the cold (first) and warm (second) headless run of main.py, both with
+    the old eager imports reproduced up front ("before") and as the page
+    now loads them lazily ("after")
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What main.py imported at the top before deferring the heavy modules
+EAGER_MODULES = ['plotly.graph_objects', 'zxcvbn', 'password_insights', 'assets.password_tips']
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+def import_cost(module):
+    """Seconds to import a module in a fresh interpreter."""
+    code = IMPORT_SNIPPET.format(root=ROOT, module=module)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT)
+    return float(output.stdout.strip().splitlines()[-1])
+
+def page_child(eager):
+    """Runs inside the child interpreter: time a cold and a warm page run."""
+    import time
+
+    sys.path.insert(0, ROOT)
+    os.chdir(tempfile.mkdtemp(prefix='pw-startup-'))
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    if eager:
+        for module in EAGER_MODULES:
+            __import__(module)
+    app = AppTest.from_file(os.path.join(ROOT, 'main.py'), default_timeout=60)
+    app.run()
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app.run()
+    warm = time.perf_counter() - start
+
+    print(json.dumps({'cold': cold, 'warm': warm}))
+
+def page_times(eager):
+    """Cold and warm page run times measured in a fresh interpreter."""
+    command = [sys.executable, os.path.abspath(__file__), '--child', 'eager' if eager else 'lazy']
+    output = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import and first-paint times for main.py.")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument('--child', choices=['eager', 'lazy'], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        page_child(args.child == 'eager')
+        return 0
+
+    print(f"{'module':<28}{'cold import (ms)':>18}")
+    for module in EAGER_MODULES + ['password_analyzer']:
+        cost = statistics.median(import_cost(module) for _ in range(args.repeat))
+        print(f"{module:<28}{cost * 1000:>18.1f}")
+
+    print()
+    print(f"{'page run':<28}{'cold (ms)':>12}{'warm (ms)':>12}")
+    for label, eager in [('before (eager imports)', True), ('after (lazy imports)', False)]:
+        runs = [page_times(eager) for _ in range(args.repeat)]
+        cold = statistics.median(run['cold'] for run in runs)
+        warm = statistics.median(run['warm'] for run in runs)
+        print(f"{label:<28}{cold * 1000:>12.1f}{warm * 1000:>12.1f}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
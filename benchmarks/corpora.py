@@ -0,0 +1,82 @@
+"""
+Synthetic password corpora for the benchmarks.
+
+Every corpus is generated from a fixed seed so that runs on different
+machines and commits measure the same inputs.
+"""
+import random
+import string
+
+COMMON_PASSWORDS = [
+    "123456", "password", "123456789", "12345678", "12345", "qwerty", "abc123",
+    "football", "monkey", "letmein", "111111", "1234567", "dragon", "baseball",
+    "sunshine", "iloveyou", "trustno1", "princess", "admin", "welcome",
+    "shadow", "superman", "michael", "master", "hello123", "freedom", "whatever",
+    "qazwsx", "passw0rd", "starwars"
+]
+
+WORDS = [
+    "apple", "river", "castle", "orange", "window", "silver", "planet", "garden",
+    "rocket", "pencil", "forest", "bridge", "candle", "dragon", "mirror", "winter",
+    "yellow", "pirate", "cookie", "jungle", "marble", "ticket", "violet", "anchor",
+    "basket", "copper", "desert", "falcon", "guitar", "harbor", "island", "jacket",
+    "kitten", "lemon", "magnet", "needle", "oyster", "pepper", "quartz", "rabbit",
+    "saddle", "tomato", "umbrella", "velvet", "walnut", "zipper", "horse", "battery",
+    "staple", "correct"
+]
+
+UNICODE_ALPHABET = "äöüßéèêñçøåæœłśżźğışαβγδεζηθλμπσφωжзийклмнпфцчшщ你好世界密码안녕하세요パスワード٣٤٥"
+
+def short_common(count, rng):
+    """Common passwords with light mutations, mostly under 10 characters."""
+    passwords = []
+    for _ in range(count):
+        password = rng.choice(COMMON_PASSWORDS)
+        mutation = rng.random()
+        if mutation < 0.3:
+            password = password.capitalize()
+        elif mutation < 0.6:
+            password += str(rng.randint(0, 99))
+        elif mutation < 0.7:
+            password += "!"
+        passwords.append(password)
+    return passwords
+
+def long_random(count, rng):
+    """Random printable passwords of 20-64 characters."""
+    alphabet = string.ascii_letters + string.digits + string.punctuation
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(20, 64))) for _ in range(count)]
+
+def passphrases(count, rng):
+    """Three to six dictionary words joined by a separator."""
+    passwords = []
+    for _ in range(count):
+        separator = rng.choice([" ", "-", "", "_", "."])
+        passwords.append(separator.join(rng.choice(WORDS) for _ in range(rng.randint(3, 6))))
+    return passwords
+
+def unicode_mix(count, rng):
+    """Passwords mixing non-ASCII letters with ASCII characters."""
+    alphabet = UNICODE_ALPHABET + string.ascii_letters + string.digits
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(8, 24))) for _ in range(count)]
+
+CORPORA = {
+    'short_common': short_common,
+    'long_random': long_random,
+    'passphrase': passphrases,
+    'unicode': unicode_mix
+}
+
+def build_corpus(name, count, seed=1234):
+    """
+    Generates one of the named corpora.
+
+    Args:
+        name (str): Key of CORPORA
+        count (int): Number of passwords to generate
+        seed (int): Random seed
+
+    Returns:
+        list: The generated passwords
+    """
+    return CORPORA[name](count, random.Random(f"{seed}:{name}"))
@@ -0,0 +1,188 @@
+"""
+Load-test client for the HTTP analysis service.
+
+Opens a number of keep-alive connections, each sending requests back to back
+for a fixed duration, and reports sustained requests per second and latency
+percentiles. Passwords are drawn from the benchmark corpora. With --spawn the
+service is started on a free local port for the duration of the run.
+
+Usage:
+    python benchmarks/load_test.py --spawn --workers 4 --connections 32 --duration 10
+    python benchmarks/load_test.py --url http://127.0.0.1:8080 --batch 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpora import CORPORA, build_corpus
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def request(reader, writer, host, method, path, payload=None):
+    """Sends one request on a keep-alive connection and returns (status, body)."""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split(b' ', 2)[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def client(host, port, passwords, batch, backend, deadline, latencies, errors, degraded, seed):
+    """One keep-alive connection sending requests until the deadline."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            if batch:
+                path, payload = '/analyze/batch', {'passwords': rng.sample(passwords, batch)}
+            else:
+                path, payload = '/analyze', {'password': rng.choice(passwords)}
+            if backend:
+                payload['backend'] = backend
+
+            start = time.perf_counter()
+            try:
+                status, body = await request(reader, writer, host, 'POST', path, payload)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors.append('connection')
+                break
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            elif b'"degraded": true' in body:
+                degraded.append(1)
+    finally:
+        writer.close()
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await request(reader, writer, host, 'GET', '/stats')
+        return json.loads(body)
+    finally:
+        writer.close()
+
+async def run(host, port, passwords, connections, duration, batch, backend):
+    latencies = []
+    errors = []
+    degraded = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        client(host, port, passwords, batch, backend, deadline, latencies, errors, degraded, seed)
+        for seed in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, len(degraded), elapsed, await fetch_stats(host, port)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def spawn_service(port, workers, executor, service_args=()):
+    """Starts service.py in a child process and waits until it answers."""
+    command = [sys.executable, os.path.join(ROOT, 'service.py'), '--port', str(port), '--executor', executor]
+    if workers:
+        command += ['--workers', str(workers)]
+    command += list(service_args)
+    process = subprocess.Popen(command, cwd=ROOT)
+
+    for _ in range(300):
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.1):
+                return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("service.py exited during startup")
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("service.py did not start listening")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure sustained throughput and tail latency of service.py.")
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help="Service to load (ignored with --spawn)")
+    parser.add_argument('--spawn', action='store_true', help="Start service.py on a free port for the run")
+    parser.add_argument('--workers', type=int, default=None, help="Pool size of the spawned service")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process', help="Pool type of the spawned service")
+    parser.add_argument('--service-arg', action='append', default=[], metavar='ARG',
+                        help="Extra argument for the spawned service, e.g. --service-arg=--max-queue=8 (repeatable)")
+    parser.add_argument('-c', '--connections', type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help="Seconds to run")
+    parser.add_argument('--batch', type=int, default=0, help="Passwords per batch request (0 sends single requests)")
+    parser.add_argument('--backend', help="Estimator backend to request")
+    parser.add_argument('--corpus', action='append', choices=sorted(CORPORA), help="Corpus to draw from (repeatable, default: all)")
+    parser.add_argument('--count', type=int, default=2000, help="Passwords per corpus")
+    parser.add_argument('--seed', type=int, default=1234, help="Corpus random seed")
+    args = parser.parse_args(argv)
+
+    passwords = [password for name in args.corpus or CORPORA for password in build_corpus(name, args.count, args.seed)]
+
+    process = None
+    if args.spawn:
+        host, port = '127.0.0.1', free_port()
+        process = spawn_service(port, args.workers, args.executor, args.service_arg)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+
+    try:
+        latencies, errors, degraded, elapsed, stats = asyncio.run(
+            run(host, port, passwords, args.connections, args.duration, args.batch, args.backend)
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    latencies.sort()
+    per_request = max(1, args.batch)
+    print(f"connections {args.connections}, {'batch of ' + str(args.batch) if args.batch else 'single'} requests, {elapsed:.1f}s")
+    print(f"requests      {len(latencies):>12,}")
+    print(f"errors        {len(errors):>12,}")
+    print(f"rate limited  {errors.count(429):>12,}")
+    print(f"degraded      {degraded:>12,}")
+    print(f"requests/s    {len(latencies) / elapsed:>12,.1f}")
+    print(f"passwords/s   {len(latencies) * per_request / elapsed:>12,.1f}")
+    for label, fraction in [('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p99.9', 0.999)]:
+        print(f"{label + ' ms':<14}{percentile(latencies, fraction) * 1000:>12.2f}")
+    print(f"{'max ms':<14}{(latencies[-1] if latencies else 0.0) * 1000:>12.2f}")
+    print(f"server: {stats['analyzed']:,} analyzed, {stats['coalesced']:,} coalesced, "
+          f"{stats['cache']['hit_rate']:.1%} cache hit rate, {stats['connections']:,} connections")
+    if 'admission' in stats:
+        admission = stats['admission']
+        print(f"admission: {admission['admitted']:,} admitted, {admission['shed']:,} shed "
+              f"({admission['timed_out']:,} timed out), {admission['rate_limited']:,} rate limited, "
+              f"wait p50 {admission['wait_seconds_p50'] * 1000:.1f} ms, p99 {admission['wait_seconds_p99'] * 1000:.1f} ms")
+    return 1 if len(errors) > errors.count(429) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
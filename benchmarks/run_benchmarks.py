@@ -0,0 +1,214 @@
+"""
+Benchmark suite for the password analysis pipeline.
+
+Runs every stage over each synthetic corpus and reports p50/p99 latency,
+throughput and peak traced memory. Results can be saved as a JSON baseline
+and compared against a previous baseline, failing when any metric regresses
+beyond the threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py --save baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import estimators
+import password_analyzer
+from corpora import CORPORA, build_corpus
+from password_insights import get_password_hash_preview
+from scanner import scan_password
+
+STAGES = {
+    'analyze_password': password_analyzer.analyze_password,
+    'zxcvbn_estimate': estimators.zxcvbn_estimate,
+    'heuristic_estimate': estimators.heuristic_estimate,
+    'dictionary_estimate': estimators.dictionary_estimate,
+    'scan_password': scan_password,
+    'check_length': password_analyzer.check_length,
+    'check_uppercase': password_analyzer.check_uppercase,
+    'check_lowercase': password_analyzer.check_lowercase,
+    'check_numbers': password_analyzer.check_numbers,
+    'check_special_chars': password_analyzer.check_special_chars,
+    'check_common_patterns': password_analyzer.check_common_patterns,
+    'check_repetition': password_analyzer.check_repetition,
+    'get_password_hash_preview': get_password_hash_preview
+}
+
+# Metrics where a larger value is a regression
+LOWER_IS_BETTER = ['p50_us', 'p99_us', 'peak_kib']
+HIGHER_IS_BETTER = ['throughput']
+
+# Placeholder main.py shows while an analysis is still running
+PENDING_MESSAGE = "Analyzing password strength..."
+
+class PageRenderer:
+    """
+    Renders main.py headlessly for one password check per call.
+
+    A check that doesn't finish inline is first drawn as a placeholder and
+    filled in by a later rerun, so a call only returns once the results are
+    on the page.
+    """
+
+    def __init__(self):
+        from streamlit.testing.v1 import AppTest
+
+        # The page persists its history next to the working directory
+        self._workdir = tempfile.mkdtemp(prefix='pw-bench-')
+        os.chdir(self._workdir)
+        self._app = AppTest.from_file(os.path.join(ROOT, 'main.py'), default_timeout=60)
+        self._app.run()
+
+    def __call__(self, password):
+        self._app.text_input(key='password_input').input(password)
+        self._app.button(key='check_strength').click()
+        self._app.run()
+        if any(info.value == PENDING_MESSAGE for info in self._app.info):
+            self._app.session_state['analysis_job']['future'].result()
+            self._app.run()
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def measure(stage, passwords):
+    """
+    Times one stage over a corpus.
+
+    Latency and throughput come from an untraced pass; peak memory from a
+    second pass under tracemalloc.
+
+    Args:
+        stage (callable): Function taking a password
+        passwords (list): The corpus
+
+    Returns:
+        dict: p50/p99 latency in microseconds, throughput per second and peak KiB
+    """
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    for password in passwords:
+        start = clock()
+        stage(password)
+        latencies.append(clock() - start)
+    elapsed = clock() - started
+
+    tracemalloc.start()
+    for password in passwords:
+        stage(password)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'count': len(passwords),
+        'mean_us': statistics.fmean(latencies) * 1e6,
+        'p50_us': percentile(latencies, 0.50) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6,
+        'throughput': len(passwords) / elapsed if elapsed else float('inf'),
+        'peak_kib': peak / 1024
+    }
+
+def run(stages, corpora, count, render_count, seed):
+    results = {}
+    for corpus_name in corpora:
+        corpus = build_corpus(corpus_name, count, seed)
+        for stage_name, stage in stages.items():
+            sample = corpus[:render_count] if stage_name == 'render_page' else corpus
+            results[f"{corpus_name}/{stage_name}"] = measure(stage, sample)
+    return results
+
+def compare(results, baseline, threshold):
+    """
+    Compares results with a baseline.
+
+    Args:
+        results (dict): Current results keyed by "corpus/stage"
+        baseline (dict): Baseline results in the same shape
+        threshold (float): Allowed relative regression, e.g. 0.2 for 20%
+
+    Returns:
+        list: Human-readable descriptions of every regression
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in LOWER_IS_BETTER:
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{key} {metric}: {previous[metric]:.1f} -> {current[metric]:.1f}")
+        for metric in HIGHER_IS_BETTER:
+            if current[metric] < previous[metric] * (1 - threshold):
+                regressions.append(f"{key} {metric}: {previous[metric]:.1f} -> {current[metric]:.1f}")
+    return regressions
+
+def print_table(results):
+    print(f"{'corpus/stage':<44}{'p50 us':>10}{'p99 us':>10}{'ops/s':>12}{'peak KiB':>10}")
+    for key, metrics in results.items():
+        print(f"{key:<44}{metrics['p50_us']:>10.1f}{metrics['p99_us']:>10.1f}"
+              f"{metrics['throughput']:>12,.0f}{metrics['peak_kib']:>10.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the password analysis pipeline.")
+    parser.add_argument('--count', type=int, default=500, help="Passwords per corpus")
+    parser.add_argument('--seed', type=int, default=1234, help="Corpus random seed")
+    parser.add_argument('--corpus', action='append', choices=sorted(CORPORA), help="Corpus to run (repeatable, default: all)")
+    parser.add_argument('--stage', action='append', help="Stage to run (repeatable, default: all)")
+    parser.add_argument('--render', action='store_true', help="Also time full page renders of main.py (needs streamlit)")
+    parser.add_argument('--render-count', type=int, default=5, help="Page renders per corpus")
+    parser.add_argument('--save', metavar='FILE', help="Write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', help="Baseline to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative regression (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    stages = dict(STAGES)
+    if args.render:
+        stages['render_page'] = PageRenderer()
+    if args.stage:
+        unknown = set(args.stage) - set(stages)
+        if unknown:
+            parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+        stages = {name: stages[name] for name in args.stage}
+
+    results = run(stages, args.corpus or list(CORPORA), args.count, args.render_count, args.seed)
+    print_table(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'count': args.count,
+                'seed': args.seed,
+                'results': results
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Tier usage and agreement report for the tiered estimator.
+
+Runs every password of the reference corpora (and optionally a password
+file) through the tiered backend's fast tier and through full zxcvbn, then
+reports per corpus how many passwords each tier settled, how often a
+fast-tier score disagrees with zxcvbn and the time spent with and without
+tiering.
+
+Usage:
+    python benchmarks/tier_agreement.py --count 1000
+    python benchmarks/tier_agreement.py --file passwords.txt
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpora import CORPORA, build_corpus
+from estimators import fast_tier, zxcvbn_estimate
+
+def compare(passwords):
+    """
+    Compares the fast tier with zxcvbn over a list of passwords.
+
+    Returns:
+        dict: Tier counts, disagreements, score deltas and timings
+    """
+    tiers = Counter()
+    disagreements = Counter()
+    deltas = Counter()
+    examples = []
+    tiered_seconds = zxcvbn_seconds = 0.0
+
+    for password in passwords:
+        start = time.perf_counter()
+        tier, estimate = fast_tier(password)
+        fast_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = zxcvbn_estimate(password)
+        full_seconds = time.perf_counter() - start
+
+        zxcvbn_seconds += full_seconds
+        if estimate is None:
+            tiers['zxcvbn'] += 1
+            tiered_seconds += fast_seconds + full_seconds
+            continue
+
+        tiers[tier] += 1
+        tiered_seconds += fast_seconds
+        delta = estimate['score'] - reference['score']
+        if delta:
+            disagreements[tier] += 1
+            deltas[delta] += 1
+            if len(examples) < 5:
+                examples.append((password, estimate['score'], reference['score']))
+
+    return {
+        'tiers': tiers,
+        'disagreements': disagreements,
+        'deltas': deltas,
+        'examples': examples,
+        'tiered_seconds': tiered_seconds,
+        'zxcvbn_seconds': zxcvbn_seconds
+    }
+
+def print_report(name, passwords, report):
+    total = len(passwords)
+    tiers = report['tiers']
+    settled = tiers['fast_weak'] + tiers['fast_strong']
+    disagreed = sum(report['disagreements'].values())
+
+    print(f"{name} ({total:,} passwords)")
+    for tier in ('fast_weak', 'fast_strong', 'zxcvbn'):
+        print(f"  {tier:<12}{tiers[tier]:>8,}  {tiers[tier] / total:>6.1%}")
+    rate = disagreed / settled if settled else 0.0
+    print(f"  fast-tier disagreements with zxcvbn: {disagreed:,} of {settled:,} ({rate:.2%})")
+    if report['deltas']:
+        deltas = ', '.join(f"{delta:+d}: {count:,}" for delta, count in sorted(report['deltas'].items()))
+        print(f"  score deltas (fast - zxcvbn): {deltas}")
+    for password, fast_score, zxcvbn_score in report['examples']:
+        print(f"    {password!r}: fast {fast_score}, zxcvbn {zxcvbn_score}")
+    speedup = report['zxcvbn_seconds'] / report['tiered_seconds'] if report['tiered_seconds'] else 0.0
+    print(f"  time: tiered {report['tiered_seconds'] * 1000:,.1f} ms, zxcvbn only {report['zxcvbn_seconds'] * 1000:,.1f} ms ({speedup:.1f}x)")
+    print()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the tiered estimator's fast tier with zxcvbn.")
+    parser.add_argument('--count', type=int, default=500, help="Passwords per corpus")
+    parser.add_argument('--seed', type=int, default=1234, help="Corpus random seed")
+    parser.add_argument('--corpus', action='append', choices=sorted(CORPORA), help="Corpus to run (repeatable, default: all)")
+    parser.add_argument('--file', metavar='FILE', help="Also compare a newline-delimited password file")
+    parser.add_argument('--max-disagreement', type=float, default=None,
+                        help="Exit non-zero if any corpus' fast-tier disagreement rate exceeds this fraction")
+    args = parser.parse_args(argv)
+
+    corpora = {name: build_corpus(name, args.count, args.seed) for name in args.corpus or CORPORA}
+    if args.file:
+        with open(args.file, encoding='utf-8', errors='replace') as f:
+            corpora[os.path.basename(args.file)] = [line.rstrip('\r\n') for line in f]
+
+    failed = False
+    for name, passwords in corpora.items():
+        # zxcvbn refuses passwords past its length limit, so leave those out
+        passwords = [password for password in passwords if len(password) <= 72]
+        report = compare(passwords)
+        print_report(name, passwords, report)
+
+        settled = report['tiers']['fast_weak'] + report['tiers']['fast_strong']
+        rate = sum(report['disagreements'].values()) / settled if settled else 0.0
+        if args.max_disagreement is not None and rate > args.max_disagreement:
+            failed = True
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
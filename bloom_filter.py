@@ -0,0 +1,154 @@
+"""
+Bloom filter pre-screen for breached-password checks.
+
+The filter is built once from a sorted SHA-1 hash file (see breach_check)
+and stored as a single file that is memory-mapped read-only at lookup time.
+A negative answer is definitive, so most passwords never reach the on-disk
+index. Bit positions are derived from the SHA-1 digest itself, which is
+already uniformly distributed.
+
+Usage:
+    python bloom_filter.py pwned-passwords-sha1.txt breach.bloom --fp-rate 0.001
+"""
+import argparse
+import hashlib
+import math
+import mmap
+import struct
+import sys
+
+MAGIC = b'PWBLOOM1'
+HEADER = struct.Struct('<8sQQQ')  # magic, number of bits, number of hashes, number of items
+
+def optimal_parameters(items, fp_rate):
+    """
+    Computes the bit count and hash count for a target false-positive rate.
+
+    Args:
+        items (int): Number of items the filter will hold
+        fp_rate (float): Target false-positive probability, e.g. 0.001
+
+    Returns:
+        tuple: (number of bits, number of hash functions)
+    """
+    items = max(1, items)
+    num_bits = max(8, math.ceil(-items * math.log(fp_rate) / (math.log(2) ** 2)))
+    num_hashes = max(1, round(num_bits / items * math.log(2)))
+    return num_bits, num_hashes
+
+def _bit_positions(digest, num_bits, num_hashes):
+    """Double hashing over two 64-bit halves of the digest."""
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:16], 'little') | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+class BloomFilter:
+    """
+    Read-only, memory-mapped Bloom filter over SHA-1 digests.
+
+    Args:
+        path (str): Path of a filter file written by build_bloom_filter
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.num_bits, self.num_hashes, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a password Bloom filter file")
+
+    def contains_digest(self, digest):
+        """
+        Checks whether a SHA-1 digest may be in the set.
+
+        Args:
+            digest (bytes): Raw 20-byte SHA-1 digest
+
+        Returns:
+            bool: False if definitely absent, True if possibly present
+        """
+        data = self._map
+        offset = HEADER.size
+        for position in _bit_positions(digest, self.num_bits, self.num_hashes):
+            if not data[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __contains__(self, password):
+        return self.contains_digest(hashlib.sha1(password.encode('utf-8', 'surrogatepass')).digest())
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _iter_hash_file(path):
+    """Yield raw SHA-1 digests from a HASH[:COUNT] text file."""
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield bytes.fromhex(line[:40].decode('ascii'))
+
+def build_bloom_filter(hash_file, output, fp_rate=0.001, items=None):
+    """
+    Builds a filter file from a SHA-1 hash file.
+
+    The bit array is written through a memory map, so building does not need
+    the filter to fit in RAM.
+
+    Args:
+        hash_file (str): Path of the HASH[:COUNT] text file
+        output (str): Path of the filter file to write
+        fp_rate (float): Target false-positive probability
+        items (int): Number of hashes in the file, counted if not given
+
+    Returns:
+        dict: Bits, hash functions, items and on-disk size of the filter
+    """
+    if items is None:
+        items = sum(1 for _ in _iter_hash_file(hash_file))
+    num_bits, num_hashes = optimal_parameters(items, fp_rate)
+    size = HEADER.size + (num_bits + 7) // 8
+
+    with open(output, 'wb') as f:
+        f.truncate(size)
+
+    with open(output, 'r+b') as f, mmap.mmap(f.fileno(), size) as data:
+        HEADER.pack_into(data, 0, MAGIC, num_bits, num_hashes, items)
+        offset = HEADER.size
+        for digest in _iter_hash_file(hash_file):
+            for position in _bit_positions(digest, num_bits, num_hashes):
+                data[offset + (position >> 3)] |= 1 << (position & 7)
+        data.flush()
+
+    return {
+        'bits': num_bits,
+        'hashes': num_hashes,
+        'items': items,
+        'bytes': size
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a Bloom filter from a sorted SHA-1 hash file.")
+    parser.add_argument('hash_file', help="HIBP-style HASH[:COUNT] file")
+    parser.add_argument('output', help="Filter file to write")
+    parser.add_argument('--fp-rate', type=float, default=0.001, help="Target false-positive rate (default: 0.001)")
+    parser.add_argument('--items', type=int, default=None, help="Number of hashes in the file, if known")
+    args = parser.parse_args(argv)
+
+    info = build_bloom_filter(args.hash_file, args.output, args.fp_rate, args.items)
+    sys.stderr.write(f"Wrote {args.output}: {info['items']:,} items, {info['bits']:,} bits, "
+                     f"{info['hashes']} hashes, {info['bytes'] / 2**20:.1f} MiB\n")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
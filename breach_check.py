@@ -0,0 +1,204 @@
+"""
+Offline breached-password lookup against a local HIBP-style hash file.
+
+The file holds one uppercase SHA-1 hash per line, sorted by hash, optionally
+followed by ':' and a breach count (the "Pwned Passwords" download format).
+It is memory-mapped and binary-searched, so lookups touch only a handful of
+pages and the file is never loaded into RAM. An optional Bloom filter built
+from the same file (see bloom_filter) answers most negatives before the
+index is touched.
+"""
+import hashlib
+import mmap
+import os
+import threading
+
+from bloom_filter import BloomFilter
+
+# Path of the sorted SHA-1 hash file to use by default
+BREACH_FILE_ENV = 'PASSWORD_BREACH_FILE'
+
+# Path of the Bloom filter built from that file, if any
+BREACH_BLOOM_ENV = 'PASSWORD_BREACH_BLOOM'
+
+SHA1_HEX_LENGTH = 40
+
+class BreachIndex:
+    """
+    Read-only, memory-mapped view of a sorted SHA-1 hash file.
+
+    Args:
+        path (str): Path of the hash file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files; an empty index simply never matches
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+
+    def lookup_hash(self, sha1_hex):
+        """
+        Looks up a SHA-1 hash.
+
+        Args:
+            sha1_hex (str): Hex-encoded SHA-1 digest
+
+        Returns:
+            int: Number of times the hash appears in breaches, or 0 if absent.
+                Files without counts report 1 for every hit.
+        """
+        target = sha1_hex.upper().encode('ascii')
+        data = self._map
+        lo, hi = 0, self.size
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b'\n', 0, mid) + 1
+            end = data.find(b'\n', mid)
+            if end == -1:
+                end = self.size
+
+            key = data[start:start + SHA1_HEX_LENGTH].upper()
+            if key == target:
+                count = data[start + SHA1_HEX_LENGTH + 1:end].strip()
+                return int(count) if count.isdigit() else 1
+            elif key < target:
+                lo = end + 1
+            else:
+                hi = start
+
+        return 0
+
+    def lookup(self, password):
+        """
+        Looks up a password by its SHA-1 hash.
+
+        Args:
+            password (str): The password to check
+
+        Returns:
+            int: Number of times the password appears in breaches
+        """
+        return self.lookup_hash(hashlib.sha1(password.encode('utf-8', 'surrogatepass')).hexdigest())
+
+    def close(self):
+        if self.size:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_breach_index = None
+_breach_configured = False
+_bloom_filter = None
+_bloom_configured = False
+_breach_lock = threading.Lock()
+
+def configure_breach_index(path):
+    """
+    Sets the hash file used by check_breached.
+
+    Args:
+        path (str): Path of the sorted SHA-1 hash file, or None to disable
+
+    Returns:
+        BreachIndex: The opened index, or None when disabled
+    """
+    global _breach_index, _breach_configured
+    index = BreachIndex(path) if path else None
+    with _breach_lock:
+        previous, _breach_index = _breach_index, index
+        _breach_configured = True
+    if previous is not None:
+        previous.close()
+    return index
+
+def get_breach_index():
+    """
+    Returns the configured breach index, opening PASSWORD_BREACH_FILE on first use.
+
+    Returns:
+        BreachIndex: The shared index, or None if no hash file is configured
+    """
+    if not _breach_configured:
+        configure_breach_index(os.environ.get(BREACH_FILE_ENV))
+    return _breach_index
+
+def configure_bloom_filter(path):
+    """
+    Sets the Bloom filter consulted before the breach index.
+
+    Args:
+        path (str): Path of a filter file from bloom_filter, or None to disable
+
+    Returns:
+        BloomFilter: The opened filter, or None when disabled
+    """
+    global _bloom_filter, _bloom_configured
+    bloom = BloomFilter(path) if path else None
+    with _breach_lock:
+        previous, _bloom_filter = _bloom_filter, bloom
+        _bloom_configured = True
+    if previous is not None:
+        previous.close()
+    return bloom
+
+def get_bloom_filter():
+    """
+    Returns the configured Bloom filter, opening PASSWORD_BREACH_BLOOM on first use.
+
+    Returns:
+        BloomFilter: The shared filter, or None if none is configured
+    """
+    if not _bloom_configured:
+        configure_bloom_filter(os.environ.get(BREACH_BLOOM_ENV))
+    return _bloom_filter
+
+def check_breached(password):
+    """
+    Check if password appears in the local breached-password corpus.
+
+    Args:
+        password (str): The password to check
+
+    Returns:
+        dict: A strength_details entry, or None if neither a breach file nor
+            a Bloom filter is configured
+    """
+    index = get_breach_index()
+    bloom = get_bloom_filter()
+    if index is None and bloom is None:
+        return None
+
+    digest = hashlib.sha1(password.encode('utf-8', 'surrogatepass')).digest()
+
+    # A Bloom filter miss is definitive, so most passwords stop here
+    if bloom is not None and not bloom.contains_digest(digest):
+        count = 0
+    elif index is None:
+        return {
+            'pass': False,
+            'message': "Possibly found in known data breaches",
+            'count': None
+        }
+    else:
+        count = index.lookup_hash(digest.hex())
+
+    if count:
+        return {
+            'pass': False,
+            'message': f"Found in known data breaches ({count:,} times)",
+            'count': count
+        }
+    else:
+        return {
+            'pass': True,
+            'message': "Not found in known data breaches",
+            'count': 0
+        }
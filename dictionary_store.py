@@ -0,0 +1,243 @@
+"""
+Compiled, memory-mapped frequency dictionaries shared across processes.
+
+zxcvbn builds a Python dict per frequency list in every process that imports
+it. This module compiles those lists, plus any custom word lists, once into
+a compact file: per dictionary, a sorted UTF-8 string table with offset and
+rank arrays and a small hash bitmap for fast negative lookups. Every worker
+maps the file read-only, so the pages are shared through the OS page cache
+and loading is close to instant.
+
+Lookups are binary searches in Python rather than dict probes, so analysis
+is slower than with zxcvbn's own dicts; use the store where per-worker
+memory matters more than single-password latency.
+
+Usage:
+    python dictionary_store.py dictionaries.bin --list company=company_terms.txt
+"""
+import argparse
+import mmap
+import struct
+import sys
+import types
+import zlib
+from collections.abc import Mapping
+
+from pattern_matcher import load_word_list
+
+MAGIC = b'PWDICT01'
+FILE_HEADER = struct.Struct('<8sI')       # magic, number of dictionaries
+SECTION_HEADER = struct.Struct('<IIIQQQQQ')  # name length, word count, longest word, filter bits, offsets, ranks, strings, filter positions
+FILTER_BITS_PER_WORD = 16
+
+# Path of a compiled store to install when zxcvbn is first loaded
+DICTIONARY_STORE_ENV = 'PASSWORD_DICTIONARY_STORE'
+
+def _align(position, boundary=8):
+    return (position + boundary - 1) // boundary * boundary
+
+def _filter_position(encoded, filter_bits):
+    return zlib.crc32(encoded) % filter_bits
+
+class MappedRankedDictionary(Mapping):
+    """
+    Read-only word -> rank mapping backed by a section of a mapped store.
+
+    Drop-in replacement for the dicts in zxcvbn.matching.RANKED_DICTIONARIES.
+    """
+
+    def __init__(self, data, count, max_bytes, filter_bits, offsets_at, ranks_at, strings_at, filter_at):
+        view = memoryview(data)
+        self._count = count
+        self._max_bytes = max_bytes
+        self._filter_bits = filter_bits
+        self._offsets = view[offsets_at:offsets_at + 4 * (count + 1)].cast('I')
+        self._ranks = view[ranks_at:ranks_at + 4 * count].cast('I')
+        self._strings = data
+        self._strings_at = strings_at
+        self._filter = view[filter_at:filter_at + (filter_bits + 7) // 8]
+
+    def _word_bytes(self, index):
+        start = self._strings_at + self._offsets[index]
+        return self._strings[start:self._strings_at + self._offsets[index + 1]]
+
+    def _index(self, word):
+        """Position of word in the string table, or -1 if absent."""
+        # A word can't have fewer UTF-8 bytes than characters, so most of the
+        # long substrings zxcvbn probes are rejected before hashing
+        if not isinstance(word, str) or len(word) > self._max_bytes:
+            return -1
+        encoded = word.encode('utf-8')
+        position = zlib.crc32(encoded) % self._filter_bits
+        if not self._filter[position >> 3] & (1 << (position & 7)):
+            return -1
+
+        offsets, strings, base = self._offsets, self._strings, self._strings_at
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = strings[base + offsets[mid]:base + offsets[mid + 1]]
+            if candidate < encoded:
+                lo = mid + 1
+            elif candidate > encoded:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def __contains__(self, word):
+        return self._index(word) >= 0
+
+    def __getitem__(self, word):
+        index = self._index(word)
+        if index < 0:
+            raise KeyError(word)
+        return self._ranks[index]
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._word_bytes(index).decode('utf-8')
+
+    def __len__(self):
+        return self._count
+
+class DictionaryStore:
+    """
+    Memory-mapped store of ranked dictionaries.
+
+    Args:
+        path (str): Path of a file written by compile_dictionary_store
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled dictionary store")
+
+        self.dictionaries = {}
+        position = FILE_HEADER.size
+        for _ in range(count):
+            name_length, words, max_bytes, filter_bits, offsets_at, ranks_at, strings_at, filter_at = SECTION_HEADER.unpack_from(self._map, position)
+            position += SECTION_HEADER.size
+            name = bytes(self._map[position:position + name_length]).decode('utf-8')
+            position += name_length
+            self.dictionaries[name] = MappedRankedDictionary(
+                self._map, words, max_bytes, filter_bits, offsets_at, ranks_at, strings_at, filter_at
+            )
+
+def compile_dictionary_store(output, word_lists):
+    """
+    Compiles ranked word lists into a store file.
+
+    Args:
+        output (str): Path of the file to write
+        word_lists (dict): Dictionary name to words ordered by rank (most common first)
+
+    Returns:
+        dict: Dictionary name to number of words written
+    """
+    sections = []
+    for name, words in word_lists.items():
+        # Same semantics as zxcvbn's build_ranked_dict: a repeated word keeps its last rank
+        ranks = {word.lower(): rank for rank, word in enumerate(words, 1)}
+        encoded = sorted((word.encode('utf-8'), rank) for word, rank in ranks.items())
+        sections.append((name.encode('utf-8'), encoded))
+
+    # Lay out the directory first, then each dictionary's arrays
+    position = FILE_HEADER.size + sum(SECTION_HEADER.size + len(name) for name, _ in sections)
+    layout = []
+    for name, encoded in sections:
+        filter_bits = max(64, FILTER_BITS_PER_WORD * len(encoded))
+        offsets_at = _align(position)
+        ranks_at = offsets_at + 4 * (len(encoded) + 1)
+        strings_at = ranks_at + 4 * len(encoded)
+        filter_at = strings_at + sum(len(word) for word, _ in encoded)
+        position = filter_at + (filter_bits + 7) // 8
+        layout.append((filter_bits, offsets_at, ranks_at, strings_at, filter_at))
+
+    data = bytearray(position)
+    FILE_HEADER.pack_into(data, 0, MAGIC, len(sections))
+    header_at = FILE_HEADER.size
+    for (name, encoded), (filter_bits, offsets_at, ranks_at, strings_at, filter_at) in zip(sections, layout):
+        max_bytes = max((len(word) for word, _ in encoded), default=0)
+        SECTION_HEADER.pack_into(data, header_at, len(name), len(encoded), max_bytes, filter_bits, offsets_at, ranks_at, strings_at, filter_at)
+        header_at += SECTION_HEADER.size
+        data[header_at:header_at + len(name)] = name
+        header_at += len(name)
+
+        offset = 0
+        for index, (word, rank) in enumerate(encoded):
+            struct.pack_into('<I', data, offsets_at + 4 * index, offset)
+            struct.pack_into('<I', data, ranks_at + 4 * index, rank)
+            data[strings_at + offset:strings_at + offset + len(word)] = word
+            offset += len(word)
+            bit = _filter_position(word, filter_bits)
+            data[filter_at + (bit >> 3)] |= 1 << (bit & 7)
+        struct.pack_into('<I', data, offsets_at + 4 * len(encoded), offset)
+
+    with open(output, 'wb') as f:
+        f.write(data)
+
+    return {name.decode('utf-8'): len(encoded) for name, encoded in sections}
+
+def install_dictionary_store(path):
+    """
+    Points zxcvbn's matchers at the dictionaries in a mapped store.
+
+    Called before zxcvbn is imported, zxcvbn never builds its own copies of
+    the frequency lists: its frequency list module, which it only reads while
+    importing, is replaced by an empty one. Called afterwards, zxcvbn's dicts
+    are swapped out and its lists released.
+
+    Args:
+        path (str): Path of a compiled store
+
+    Returns:
+        DictionaryStore: The mapped store (keep a reference while in use)
+    """
+    store = DictionaryStore(path)
+
+    if 'zxcvbn' not in sys.modules:
+        placeholder = types.ModuleType('zxcvbn.frequency_lists')
+        placeholder.FREQUENCY_LISTS = {}
+        sys.modules['zxcvbn.frequency_lists'] = placeholder
+
+    from zxcvbn import frequency_lists, matching
+
+    # zxcvbn's matchers bind this exact dict as a default argument, so it is
+    # updated in place rather than replaced
+    matching.RANKED_DICTIONARIES.update(store.dictionaries)
+    for name in store.dictionaries:
+        if name in frequency_lists.FREQUENCY_LISTS:
+            frequency_lists.FREQUENCY_LISTS[name] = []
+    return store
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile zxcvbn's frequency lists and custom word lists into a shared store.")
+    parser.add_argument('output', help="Store file to write")
+    parser.add_argument('--list', action='append', default=[], metavar='NAME=FILE',
+                        help="Extra word list, most common word first (repeatable)")
+    parser.add_argument('--no-builtin', action='store_true', help="Leave out zxcvbn's own frequency lists")
+    args = parser.parse_args(argv)
+
+    word_lists = {}
+    if not args.no_builtin:
+        from zxcvbn.frequency_lists import FREQUENCY_LISTS
+        word_lists.update(FREQUENCY_LISTS)
+    for spec in args.list:
+        name, _, path = spec.partition('=')
+        if not path:
+            parser.error(f"--list expects NAME=FILE, got {spec!r}")
+        word_lists[name] = load_word_list(path)
+
+    counts = compile_dictionary_store(args.output, word_lists)
+    for name, count in counts.items():
+        sys.stderr.write(f"{name}: {count:,} words\n")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,573 @@
+"""
+Pluggable strength estimator backends for analyze_password.
+
+A backend is a callable taking (password, timer) and returning a dict with
+'score' (0-4), 'crack_time_seconds', 'crack_time_display', 'warnings' and
+'suggestions', the same fields analyze_password has always taken from
+zxcvbn. The timer is a profiling.StageTimer or None.
+
+Built-in backends:
+    zxcvbn      Full zxcvbn pattern matching (the default)
+    heuristic   Character-class entropy with pattern penalties, no dictionaries
+    dictionary  Whole-password lookup in the ranked dictionaries with common
+                mangling undone, falling back to the heuristic estimate
+    tiered      Settles clearly weak and clearly strong passwords with cheap
+                checks and escalates the rest to zxcvbn
+
+The default is taken from the PASSWORD_ESTIMATOR environment variable or
+set_default_backend(), and can be overridden per call.
+
+zxcvbn's matching cost grows faster than linearly with length, so passwords
+longer than the exact-length budget are estimated from zxcvbn runs over
+fixed-size windows until a time budget runs out, with a streaming estimate
+for the rest. Those results are marked 'approximate'.
+"""
+import inspect
+import math
+import os
+import time
+import zlib
+from functools import lru_cache
+
+from dictionary_store import DICTIONARY_STORE_ENV, install_dictionary_store
+from scanner import scan_password
+
+# Name of the backend used when a call doesn't choose one
+ESTIMATOR_ENV = 'PASSWORD_ESTIMATOR'
+
+# Guesses per second assumed for crack times, matching zxcvbn's
+# offline_fast_hashing_1e10_per_second scenario
+GUESSES_PER_SECOND = 1e10
+
+# Longest password given to zxcvbn whole, and the seconds a longer password
+# may spend in windowed zxcvbn passes before the rest is estimated by streaming
+EXACT_LENGTH_ENV = 'PASSWORD_EXACT_LENGTH'
+TIME_BUDGET_ENV = 'PASSWORD_TIME_BUDGET'
+DEFAULT_TIME_BUDGET = 0.25
+
+# zxcvbn stays in the low milliseconds up to about this length
+ZXCVBN_WINDOW = 32
+
+# Guess counts are capped here so crack times stay finite floats
+MAX_LOG10_GUESSES = 300
+
+_backends = {}
+_default_backend = None
+_exact_length = None
+_time_budget = None
+
+# Memory-mapped dictionaries installed into zxcvbn, if configured
+_dictionary_store = None
+
+def register_backend(name, estimator):
+    """
+    Registers an estimator backend.
+
+    Args:
+        name (str): Name used to select the backend
+        estimator (callable): Function taking (password, timer) and returning
+            the estimate dict described in the module docstring
+    """
+    _backends[name] = estimator
+
+def available_backends():
+    """
+    Returns the names of the registered backends.
+
+    Returns:
+        list: Backend names
+    """
+    return list(_backends)
+
+def set_default_backend(name):
+    """
+    Sets the backend used when analyze_password isn't given one.
+
+    Args:
+        name (str): A registered backend name, or None to restore the default
+    """
+    global _default_backend
+    if name is not None and name not in _backends:
+        raise ValueError(f"Unknown estimator backend: {name}")
+    _default_backend = name
+
+def resolve_backend(name=None):
+    """
+    Picks the backend for a call.
+
+    Args:
+        name (str): Explicit backend name, or None for the deployment default
+
+    Returns:
+        tuple: (backend name, estimator callable)
+    """
+    name = name or _default_backend or os.environ.get(ESTIMATOR_ENV) or 'zxcvbn'
+    try:
+        return name, _backends[name]
+    except KeyError:
+        raise ValueError(f"Unknown estimator backend: {name}") from None
+
+def configure_budget(exact_length=None, time_budget=None):
+    """
+    Sets the limits for analyzing long passwords.
+
+    Args:
+        exact_length (int): Longest password analyzed exactly by zxcvbn.
+            Capped at zxcvbn's own max_length. None restores the default,
+            ZXCVBN_WINDOW.
+        time_budget (float): Seconds spent on windowed zxcvbn passes for
+            longer passwords. None restores the default.
+    """
+    global _exact_length, _time_budget
+    _exact_length = exact_length
+    _time_budget = time_budget
+
+def exact_length():
+    """
+    Returns the longest password given to zxcvbn whole.
+
+    Returns:
+        int: configure_budget()'s exact_length, PASSWORD_EXACT_LENGTH or
+            ZXCVBN_WINDOW, whichever applies, never above zxcvbn's max_length
+    """
+    # zxcvbn's cost grows faster than linearly and random input near its
+    # max_length can take most of a second, so longer passwords are windowed
+    limit = _exact_length or int(os.environ.get(EXACT_LENGTH_ENV) or 0) or ZXCVBN_WINDOW
+    max_length = zxcvbn_max_length()
+    return min(limit, max_length) if max_length is not None else limit
+
+def time_budget():
+    """
+    Returns the seconds a long password may spend in windowed zxcvbn passes.
+
+    Returns:
+        float: configure_budget()'s time_budget, PASSWORD_TIME_BUDGET or the default
+    """
+    if _time_budget is not None:
+        return _time_budget
+    return float(os.environ.get(TIME_BUDGET_ENV) or DEFAULT_TIME_BUDGET)
+
+def guesses_to_score(guesses):
+    """Maps a guess count to zxcvbn's 0-4 score thresholds."""
+    delta = 5
+    if guesses < 1e3 + delta:
+        return 0
+    elif guesses < 1e6 + delta:
+        return 1
+    elif guesses < 1e8 + delta:
+        return 2
+    elif guesses < 1e10 + delta:
+        return 3
+    else:
+        return 4
+
+def display_time(seconds):
+    """
+    Formats a crack time the way zxcvbn's crack_times_display does.
+
+    A copy of zxcvbn.time_estimates.display_time, so backends that don't use
+    zxcvbn never have to import it (and build its dictionaries).
+    """
+    minute = 60
+    hour = minute * 60
+    day = hour * 24
+    month = day * 31
+    year = month * 12
+    century = year * 100
+
+    if seconds < 1:
+        return "less than a second"
+    elif seconds < minute:
+        count, unit = round(seconds), "second"
+    elif seconds < hour:
+        count, unit = round(seconds / minute), "minute"
+    elif seconds < day:
+        count, unit = round(seconds / hour), "hour"
+    elif seconds < month:
+        count, unit = round(seconds / day), "day"
+    elif seconds < year:
+        count, unit = round(seconds / month), "month"
+    elif seconds < century:
+        count, unit = round(seconds / year), "year"
+    else:
+        return "centuries"
+    return f"{count} {unit}" + ("s" if count != 1 else "")
+
+def estimate_from_guesses(guesses, warnings="", suggestions=None):
+    """
+    Builds an estimate dict from a guess count.
+
+    Args:
+        guesses (float): Estimated number of guesses needed
+        warnings (str): Warning text, empty if none
+        suggestions (list): Improvement suggestions
+
+    Returns:
+        dict: The estimate fields shared by every backend
+    """
+    seconds = guesses / GUESSES_PER_SECOND
+    return {
+        'score': guesses_to_score(guesses),
+        'crack_time_seconds': seconds,
+        'crack_time_display': display_time(seconds),
+        'warnings': warnings,
+        'suggestions': suggestions or []
+    }
+
+# zxcvbn
+
+@lru_cache(maxsize=None)
+def load_zxcvbn():
+    """
+    Imports zxcvbn on first use.
+
+    Importing zxcvbn builds its ranked frequency dictionaries, so it is
+    deferred until a password is actually analyzed. If PASSWORD_DICTIONARY_STORE
+    names a compiled dictionary store, its memory-mapped dictionaries replace
+    zxcvbn's in-memory ones.
+
+    Returns:
+        module: The zxcvbn package
+    """
+    # Use the shared memory-mapped dictionaries when a store is configured.
+    # Installing first keeps zxcvbn from building its own copies.
+    global _dictionary_store
+    store_path = os.environ.get(DICTIONARY_STORE_ENV)
+    if store_path:
+        _dictionary_store = install_dictionary_store(store_path)
+
+    import zxcvbn
+    return zxcvbn
+
+@lru_cache(maxsize=None)
+def zxcvbn_max_length():
+    """
+    Returns the longest password zxcvbn accepts.
+
+    Returns:
+        int: zxcvbn 4.5+'s max_length default, or None for older versions without a limit
+    """
+    parameter = inspect.signature(load_zxcvbn().zxcvbn).parameters.get('max_length')
+    return parameter.default if parameter is not None else None
+
+def _zxcvbn_staged(password, timer):
+    """Run zxcvbn's pipeline step by step so each step can be timed."""
+    load_zxcvbn()
+    from zxcvbn import feedback, matching, scoring, time_estimates
+
+    # Mirrors zxcvbn.zxcvbn(password) with no user inputs
+    max_length = zxcvbn_max_length()
+    if max_length is not None and len(password) > max_length:
+        raise ValueError(f"Password exceeds max length of {max_length} characters.")
+
+    with timer.stage('zxcvbn_matching'):
+        ranked_dictionaries = matching.RANKED_DICTIONARIES
+        ranked_dictionaries['user_inputs'] = matching.build_ranked_dict([])
+        matches = matching.omnimatch(password, ranked_dictionaries)
+
+    with timer.stage('zxcvbn_scoring'):
+        result = scoring.most_guessable_match_sequence(password, matches)
+        result.update(time_estimates.estimate_attack_times(result['guesses']))
+
+    with timer.stage('zxcvbn_feedback'):
+        result['feedback'] = feedback.get_feedback(result['score'], result['sequence'])
+
+    return result
+
+def zxcvbn_estimate(password, timer=None):
+    """Full zxcvbn analysis, windowed for passwords past exact_length()."""
+    if not password:
+        # zxcvbn raises IndexError on an empty string
+        return {
+            'score': 0,
+            'crack_time_seconds': 0.0,
+            'crack_time_display': display_time(0),
+            'warnings': '',
+            'suggestions': []
+        }
+    limit = exact_length()
+    if limit is not None and len(password) > limit:
+        if timer is None:
+            return windowed_zxcvbn_estimate(password)
+        with timer.stage('zxcvbn_windowed'):
+            return windowed_zxcvbn_estimate(password)
+
+    if timer is None:
+        result = load_zxcvbn().zxcvbn(password)
+    else:
+        result = _zxcvbn_staged(password, timer)
+
+    return {
+        'score': result['score'],  # 0-4, with 4 being the strongest
+        'crack_time_seconds': result['crack_times_seconds']['offline_fast_hashing_1e10_per_second'],
+        'crack_time_display': result['crack_times_display']['offline_fast_hashing_1e10_per_second'],
+        'warnings': result['feedback']['warning'],
+        'suggestions': result['feedback']['suggestions']
+    }
+
+def windowed_zxcvbn_estimate(password, budget=None, window=ZXCVBN_WINDOW):
+    """
+    Approximate zxcvbn estimate for a password too long to analyze whole.
+
+    Each distinct window of the password is analyzed by zxcvbn and the guess
+    counts are multiplied, since an attacker has to guess every window. A
+    window seen before only adds the guesses for which one it repeats.
+    Once the time budget is spent, the remaining characters are estimated
+    by streaming_log10_guesses().
+
+    Args:
+        password (str): The password to estimate
+        budget (float): Seconds to spend on zxcvbn passes (defaults to time_budget())
+        window (int): Characters per zxcvbn pass
+
+    Returns:
+        dict: Estimate with 'approximate' set
+    """
+    zxcvbn = load_zxcvbn().zxcvbn
+    deadline = time.perf_counter() + (time_budget() if budget is None else budget)
+
+    log10_guesses = 0.0
+    warnings = ""
+    suggestions = []
+    seen = set()
+    position = 0
+    while position < len(password) and time.perf_counter() < deadline:
+        chunk = password[position:position + window]
+        position += len(chunk)
+        if chunk in seen:
+            log10_guesses += math.log10(len(seen))
+            continue
+        seen.add(chunk)
+
+        result = zxcvbn(chunk)
+        log10_guesses += float(result['guesses_log10'])
+        warnings = warnings or result['feedback']['warning']
+        for suggestion in result['feedback']['suggestions']:
+            if suggestion not in suggestions:
+                suggestions.append(suggestion)
+
+    if position < len(password):
+        log10_guesses += streaming_log10_guesses(password[position:])
+
+    estimate = estimate_from_guesses(10 ** min(log10_guesses, MAX_LOG10_GUESSES), warnings, suggestions)
+    estimate['approximate'] = True
+    return estimate
+
+def streaming_log10_guesses(text):
+    """
+    Linear-time guess estimate for text of any length.
+
+    Takes the smaller of the character-class entropy and the size of the text
+    compressed with zlib, so long repetitive text isn't credited as random.
+
+    Args:
+        text (str): Text to estimate
+
+    Returns:
+        float: log10 of the estimated guesses
+    """
+    class_bits = math.log2(heuristic_guesses(scan_password(text)))
+    compressed_bits = 8 * len(zlib.compress(text.encode('utf-8', 'surrogatepass'), 9))
+    return min(class_bits, compressed_bits) * math.log10(2)
+
+# Heuristic
+
+def heuristic_guesses(scan):
+    """
+    Estimates guesses from character classes, length and pattern hits.
+
+    Args:
+        scan (PasswordScan): Scan of the password
+
+    Returns:
+        float: Estimated guesses
+    """
+    other = scan.length - scan.uppercase - scan.lowercase - scan.digits - scan.symbols
+    pool = (26 if scan.lowercase else 0) + (26 if scan.uppercase else 0) + (10 if scan.digits else 0)
+    pool += (33 if scan.symbols else 0) + (100 if other > 0 else 0)
+    if not pool:
+        return 1.0
+
+    # Characters inside repeated runs or banned terms add almost nothing
+    effective_length = scan.length - max(0, scan.max_run - 1)
+    bits_per_char = math.log2(pool)
+    bits = effective_length * bits_per_char
+    for term in scan.patterns:
+        bits -= len(term) * bits_per_char
+        bits += math.log2(10000)
+
+    return 2 ** max(0.0, min(bits, 1023.0))
+
+def heuristic_feedback(scan):
+    """Warnings and suggestions for the heuristic estimators."""
+    warnings = ""
+    suggestions = []
+    if scan.patterns:
+        warnings = "Contains common patterns or sequences."
+        suggestions.append("Avoid sequences and common words.")
+    elif scan.max_run >= 3:
+        warnings = "Repeats like \"aaa\" are easy to guess."
+        suggestions.append("Avoid repeated words and characters.")
+    if scan.length < 12:
+        suggestions.append("Add another word or two. Uncommon words are better.")
+    return warnings, suggestions
+
+def heuristic_estimate(password, timer=None):
+    """Entropy estimate from character classes, with pattern penalties."""
+    scan = scan_password(password)
+    warnings, suggestions = heuristic_feedback(scan)
+    return estimate_from_guesses(heuristic_guesses(scan), warnings, suggestions)
+
+# Dictionary
+
+L33T_UNSUBSTITUTIONS = str.maketrans({'@': 'a', '4': 'a', '3': 'e', '1': 'i', '!': 'i', '0': 'o', '$': 's', '5': 's', '7': 't'})
+
+def dictionary_rank(word):
+    """
+    Looks a word up in every ranked dictionary zxcvbn uses.
+
+    Args:
+        word (str): Lowercase word
+
+    Returns:
+        tuple: (best rank, dictionary name), or (None, None) if not found
+    """
+    from zxcvbn import matching
+
+    load_zxcvbn()
+    best_rank, best_name = None, None
+    for name, ranked in matching.RANKED_DICTIONARIES.items():
+        rank = ranked.get(word)
+        if rank is not None and (best_rank is None or rank < best_rank):
+            best_rank, best_name = rank, name
+    return best_rank, best_name
+
+def dictionary_estimate(password, timer=None):
+    """
+    Estimates guesses for a dictionary word with common mangling.
+
+    Undoes capitalization, l33t substitutions and a trailing run of digits or
+    symbols, then looks the result up in the ranked dictionaries. Passwords
+    that aren't a mangled dictionary word fall back to the heuristic estimate.
+    """
+    lowered = password.lower()
+    stem = lowered.rstrip("0123456789!@#$%^&*()-_=+.?")
+    suffix_length = len(lowered) - len(stem)
+
+    rank, name = dictionary_rank(stem)
+    l33t = False
+    if rank is None:
+        unsubstituted = stem.translate(L33T_UNSUBSTITUTIONS)
+        if unsubstituted != stem:
+            rank, name = dictionary_rank(unsubstituted)
+            l33t = rank is not None
+
+    if rank is None or not stem:
+        return heuristic_estimate(password, timer)
+
+    guesses = float(rank)
+    if password[:1].isupper():
+        guesses *= 2
+    if l33t:
+        guesses *= 2
+    guesses *= 20 ** suffix_length
+
+    if name == 'passwords':
+        exact = not l33t and not suffix_length and not password[:1].isupper()
+        warnings = "This is a top-100 common password." if exact and rank <= 100 else "This is similar to a commonly used password."
+    else:
+        warnings = "A word by itself is easy to guess."
+    suggestions = ["Add another word or two. Uncommon words are better."]
+    if l33t:
+        suggestions.append("Predictable substitutions like '@' instead of 'a' don't help very much.")
+    return estimate_from_guesses(guesses, warnings, suggestions)
+
+# Tiered
+
+# Common passwords at or above this rank are settled as weak without zxcvbn.
+# zxcvbn never needs more guesses than a password's rank, so these score 0.
+COMMON_PASSWORD_RANK = 1000
+
+# zxcvbn's brute-force floor is 10 guesses per character, so passwords this
+# short always need fewer than 1,000 guesses and score 0
+SHORT_PASSWORD_LENGTH = 3
+
+# Thresholds for settling a password as strong: long, varied, pattern-free
+# and well past zxcvbn's score-4 bound of 1e10 guesses
+STRONG_MIN_LENGTH = 16
+STRONG_MIN_CLASSES = 3
+STRONG_MIN_DISTINCT = 0.6
+STRONG_MIN_GUESSES = 1e16
+
+def common_password_rank(password):
+    """
+    Returns the rank of a password in zxcvbn's common password list.
+
+    Args:
+        password (str): The password, matched exactly
+
+    Returns:
+        int: Rank (1 is the most common), or None if not listed
+    """
+    from zxcvbn import matching
+
+    load_zxcvbn()
+    return matching.RANKED_DICTIONARIES['passwords'].get(password)
+
+def fast_tier(password):
+    """
+    Cheap first-tier estimate for passwords whose score is clear.
+
+    Args:
+        password (str): The password to estimate
+
+    Returns:
+        tuple: (tier name, estimate dict) when the password is clearly weak or
+            clearly strong, otherwise (None, None)
+    """
+    if len(password) <= SHORT_PASSWORD_LENGTH:
+        scan = scan_password(password)
+        warnings, suggestions = heuristic_feedback(scan)
+        return 'fast_weak', estimate_from_guesses(10 ** len(password), warnings, suggestions)
+
+    # zxcvbn lowercases before its dictionary lookup, so only passwords
+    # without uppercase letters get the exact rank as their guess count
+    if password == password.lower():
+        rank = common_password_rank(password)
+        if rank is not None and rank <= COMMON_PASSWORD_RANK:
+            if rank <= 10:
+                warnings = "This is a top-10 common password."
+            elif rank <= 100:
+                warnings = "This is a top-100 common password."
+            else:
+                warnings = "This is a very common password."
+            return 'fast_weak', estimate_from_guesses(rank, warnings, ["Add another word or two. Uncommon words are better."])
+
+    if len(password) >= STRONG_MIN_LENGTH:
+        scan = scan_password(password)
+        classes = sum(1 for count in (scan.uppercase, scan.lowercase, scan.digits, scan.symbols) if count)
+        if (classes >= STRONG_MIN_CLASSES and not scan.patterns and scan.max_run < 3
+                and len(set(password)) >= STRONG_MIN_DISTINCT * scan.length):
+            guesses = heuristic_guesses(scan)
+            if guesses >= STRONG_MIN_GUESSES:
+                return 'fast_strong', estimate_from_guesses(guesses)
+
+    return None, None
+
+def tiered_estimate(password, timer=None):
+    """
+    Settles clear cases with fast_tier() and escalates the rest to zxcvbn.
+
+    The estimate carries the tier that produced it under 'tier'. Fast-tier
+    crack times are estimates of their own, so they can differ from zxcvbn's
+    even where the score agrees.
+    """
+    tier, estimate = fast_tier(password)
+    if estimate is None:
+        tier, estimate = 'zxcvbn', zxcvbn_estimate(password, timer)
+    return dict(estimate, tier=tier)
+
+register_backend('zxcvbn', zxcvbn_estimate)
+register_backend('heuristic', heuristic_estimate)
+register_backend('dictionary', dictionary_estimate)
+register_backend('tiered', tiered_estimate)
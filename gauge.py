@@ -0,0 +1,93 @@
+"""
+Strength gauge rendered as static SVG.
+
+The score is always 0-4, so the five possible gauges are built once at import
+and looked up on every check instead of building a Plotly figure each time.
+The drawing follows the Plotly indicator the page used before: a half-circle
+with the score bands, a bar up to the score, the number and a title.
+"""
+import math
+from html import escape
+
+from utils import get_emoji_rating, get_strength_color
+
+MAX_SCORE = 4
+
+# Score bands drawn behind the bar (as per style guide)
+STEPS = [
+    (0, 1, "#FF4B4B"),  # Very Weak
+    (1, 2, "#FF4B4B"),  # Weak
+    (2, 3, "#FFA500"),  # Medium
+    (3, 4, "#00CC66")   # Strong
+]
+
+WIDTH = 400
+HEIGHT = 270
+CENTER_X = 200
+CENTER_Y = 225
+STEP_RADII = (110, 160)
+BAR_RADII = (122, 148)
+TICK_RADIUS = 176
+TEXT_COLOR = "#E0E0E0"
+
+def _point(value, radius):
+    """Coordinates of a score on the arc, 0 at the left end and MAX_SCORE at the right."""
+    angle = math.pi * (1 - value / MAX_SCORE)
+    return CENTER_X + radius * math.cos(angle), CENTER_Y - radius * math.sin(angle)
+
+def _band(start, end, radii, color):
+    """SVG path of the ring segment between two scores."""
+    inner, outer = radii
+    x0, y0 = _point(start, outer)
+    x1, y1 = _point(end, outer)
+    x2, y2 = _point(end, inner)
+    x3, y3 = _point(start, inner)
+    return (
+        f'<path d="M{x0:.1f},{y0:.1f} A{outer},{outer} 0 0 1 {x1:.1f},{y1:.1f} '
+        f'L{x2:.1f},{y2:.1f} A{inner},{inner} 0 0 0 {x3:.1f},{y3:.1f} Z" fill="{color}"/>'
+    )
+
+def gauge_svg(score):
+    """
+    Draws the strength gauge for a score.
+
+    Args:
+        score (int): Password strength score (0-4)
+
+    Returns:
+        str: A self-contained SVG element, on a single line
+    """
+    value = min(max(score, 0), MAX_SCORE)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" role="img" '
+        f'aria-label="Password strength {score} of {MAX_SCORE}">'
+    ]
+    parts += [_band(start, end, STEP_RADII, color) for start, end, color in STEPS]
+    if value > 0:
+        parts.append(_band(0, value, BAR_RADII, get_strength_color(score)))
+
+    for tick in range(MAX_SCORE + 1):
+        x, y = _point(tick, TICK_RADIUS)
+        parts.append(f'<text x="{x:.1f}" y="{y + 5:.1f}" font-size="14" text-anchor="middle" fill="{TEXT_COLOR}">{tick}</text>')
+
+    parts.append(f'<text x="{CENTER_X}" y="{CENTER_Y - 5}" font-size="64" text-anchor="middle" fill="{TEXT_COLOR}">{score}</text>')
+    title = escape(f"Password Strength: {get_emoji_rating(score)}")
+    parts.append(f'<text x="{CENTER_X}" y="24" font-size="20" text-anchor="middle" fill="{TEXT_COLOR}">{title}</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+# Every gauge the page can show, built once per process
+GAUGES = {score: f'<div class="strength-gauge">{gauge_svg(score)}</div>' for score in range(MAX_SCORE + 1)}
+
+def gauge_html(score):
+    """
+    Returns the gauge markup for a score.
+
+    Args:
+        score (int): Password strength score (0-4)
+
+    Returns:
+        str: HTML for st.markdown(..., unsafe_allow_html=True)
+    """
+    cached = GAUGES.get(score)
+    return cached if cached is not None else f'<div class="strength-gauge">{gauge_svg(score)}</div>'
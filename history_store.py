@@ -0,0 +1,156 @@
+"""
+Append-only password check history backed by SQLite in WAL mode.
+
+Each check is a single INSERT, so writes cost O(1) regardless of history
+size and never rewrite existing records. WAL mode lets concurrent Streamlit
+sessions and processes append and read at the same time without clobbering
+each other, and a crash can at worst lose the record being written. Old
+records beyond the retention limit are pruned by a background compactor.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from metrics import HISTORY_WRITE_SECONDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    crack_time TEXT NOT NULL
+)
+"""
+
+class HistoryStore:
+    """
+    Password check history stored as an append-only SQLite table.
+
+    Args:
+        path (str): SQLite database file
+        keep (int): Number of most recent records retained by compaction
+        legacy_path (str): JSON history file from older versions, or None.
+            Imported once and then emptied.
+    """
+
+    def __init__(self, path='.password_history.db', keep=1000, legacy_path=None):
+        self.path = path
+        self.keep = keep
+        self._local = threading.local()
+        self._compactor = None
+        self._stop = threading.Event()
+
+        with self._connection() as conn:
+            conn.execute(SCHEMA)
+        if legacy_path:
+            self._import_legacy(legacy_path)
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _import_legacy(self, legacy_path):
+        # The import and the emptying of the file happen under the database's
+        # write lock, so a process starting at the same time waits and then
+        # finds nothing left to import
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            try:
+                with open(legacy_path, 'r') as f:
+                    items = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                items = None
+            if items:
+                # The legacy list is newest first
+                conn.executemany(
+                    'INSERT INTO history (date, score, crack_time) VALUES (?, ?, ?)',
+                    [(item['date'], item['score'], item['crack_time']) for item in reversed(items)]
+                )
+                with open(legacy_path, 'w') as f:
+                    json.dump([], f)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def append(self, item):
+        """
+        Appends one history record.
+
+        Args:
+            item (dict): Record with 'date', 'score' and 'crack_time' keys
+        """
+        start = time.perf_counter()
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT INTO history (date, score, crack_time) VALUES (?, ?, ?)',
+                (item['date'], item['score'], item['crack_time'])
+            )
+        HISTORY_WRITE_SECONDS.observe(time.perf_counter() - start)
+
+    def tail(self, limit=10):
+        """
+        Returns the most recent records.
+
+        Args:
+            limit (int): Maximum number of records to return
+
+        Returns:
+            list: Records as dicts, newest first
+        """
+        rows = self._connection().execute(
+            'SELECT date, score, crack_time FROM history ORDER BY id DESC LIMIT ?',
+            (limit,)
+        ).fetchall()
+        return [{"date": date, "score": score, "crack_time": crack_time} for date, score, crack_time in rows]
+
+    def clear(self):
+        """Deletes all records."""
+        with self._connection() as conn:
+            conn.execute('DELETE FROM history')
+
+    def compact(self):
+        """Prunes records beyond the retention limit and truncates the WAL."""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'DELETE FROM history WHERE id <= (SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)',
+                (self.keep,)
+            )
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def start_background_compaction(self, interval=300.0):
+        """
+        Starts a daemon thread that compacts the store periodically.
+
+        Args:
+            interval (float): Seconds between compactions
+        """
+        if self._compactor is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.compact()
+                except sqlite3.Error:
+                    # Another writer held the lock; try again next interval
+                    pass
+
+        self._compactor = threading.Thread(target=run, name='history-compactor', daemon=True)
+        self._compactor.start()
+
+    def stop_background_compaction(self):
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        self._stop.clear()
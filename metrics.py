@@ -0,0 +1,425 @@
+"""
+Process-wide metrics registry with Prometheus text export.
+
+Counters and histograms are updated under an uncontended per-series lock,
+so recording costs a few microseconds against milliseconds of analysis and
+can stay on at full load. Cache statistics are read from the caches
+themselves when metrics are rendered, so they cost nothing per lookup.
+
+Worker processes can't share memory with their parent, so pool workers send
+back snapshot(reset=True) deltas with their results and the parent merges
+them, the same way stage timings are aggregated.
+
+Export either over HTTP with serve_metrics() (GET /metrics), or to a file
+for node_exporter's textfile collector with MetricsRegistry.write() or
+write_metrics_periodically().
+"""
+import os
+import threading
+from bisect import bisect_left
+
+# Port main.py serves /metrics on, if set
+METRICS_PORT_ENV = 'PASSWORD_METRICS_PORT'
+
+# Seconds; covers cache hits through long windowed zxcvbn passes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _CounterSeries:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+class _HistogramSeries:
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+class _Metric:
+    """A named metric with one series per combination of label values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """
+        Returns the series for a combination of label values.
+
+        Args:
+            *values: One value per label name, in order
+
+        Returns:
+            The series, with inc() or observe()
+        """
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = 'counter'
+
+    def _new_series(self):
+        return _CounterSeries()
+
+    def inc(self, amount=1):
+        """Increments the unlabeled series."""
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, series in list(self._series.items()):
+            yield self.name, _format_labels(self.labelnames, values), series.value
+
+    def snapshot(self, reset):
+        data = {}
+        for values, series in list(self._series.items()):
+            with series._lock:
+                if series.value:
+                    data[values] = series.value
+                if reset:
+                    series.value = 0
+        return data
+
+    def merge(self, data):
+        for values, value in data.items():
+            self.labels(*values).inc(value)
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed buckets.
+
+    Args:
+        buckets (tuple): Upper bounds, ascending; +Inf is added automatically
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_series(self):
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value):
+        """Records a value in the unlabeled series."""
+        self.labels().observe(value)
+
+    def samples(self):
+        for values, series in list(self._series.items()):
+            with series._lock:
+                counts = list(series.counts)
+                total = series.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, [('le', _format_value(bound))])
+                yield self.name + '_bucket', labels, cumulative
+            labels = _format_labels(self.labelnames, values)
+            yield self.name + '_sum', labels, total
+            yield self.name + '_count', labels, cumulative
+
+    def snapshot(self, reset):
+        data = {}
+        for values, series in list(self._series.items()):
+            with series._lock:
+                if any(series.counts):
+                    data[values] = (list(series.counts), series.sum)
+                if reset:
+                    series.counts = [0] * len(series.counts)
+                    series.sum = 0.0
+        return data
+
+    def merge(self, data):
+        for values, (counts, total) in data.items():
+            series = self.labels(*values)
+            with series._lock:
+                for index, count in enumerate(counts):
+                    series.counts[index] += count
+                series.sum += total
+
+class GaugeFunction(_Metric):
+    """
+    Gauge or counter whose values are read from a callback at render time.
+
+    Args:
+        function (callable): Returns {label values tuple: value}
+        kind (str): 'gauge' or 'counter'
+    """
+
+    def __init__(self, name, documentation, function, labelnames=(), kind='gauge'):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self.kind = kind
+
+    def samples(self):
+        for values, value in self.function().items():
+            yield self.name, _format_labels(self.labelnames, values), value
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Returns the counter with this name, creating it if needed."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """Returns the histogram with this name, creating it if needed."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_function(self, name, documentation, function, labelnames=(), kind='gauge'):
+        """
+        Registers a metric read from a callback whenever metrics are rendered.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            function (callable): Returns {label values tuple: value}
+            labelnames (tuple): Label names
+            kind (str): 'gauge' or 'counter'
+        """
+        with self._lock:
+            metric = GaugeFunction(name, documentation, function, labelnames, kind)
+            self._metrics[name] = metric
+            return metric
+
+    def register_cache(self, name, cache):
+        """
+        Exports an AnalysisCache's hit, miss and eviction counts and size.
+
+        Args:
+            name (str): Value of the 'cache' label
+            cache (AnalysisCache): The cache to read at render time
+        """
+        with self._lock:
+            self._caches[name] = cache
+
+    def _cache_metrics(self):
+        stats = {name: cache.stats() for name, cache in list(self._caches.items())}
+        if not stats:
+            return []
+        return [
+            GaugeFunction('password_cache_hits_total', "Analysis cache hits",
+                          lambda: {(name,): s['hits'] for name, s in stats.items()}, ('cache',), 'counter'),
+            GaugeFunction('password_cache_misses_total', "Analysis cache misses",
+                          lambda: {(name,): s['misses'] for name, s in stats.items()}, ('cache',), 'counter'),
+            GaugeFunction('password_cache_evictions_total', "Analysis cache evictions",
+                          lambda: {(name,): s['evictions'] for name, s in stats.items()}, ('cache',), 'counter'),
+            GaugeFunction('password_cache_entries', "Results held in the analysis cache",
+                          lambda: {(name,): s['size'] for name, s in stats.items()}, ('cache',)),
+            GaugeFunction('password_cache_hit_ratio', "Analysis cache hits per lookup",
+                          lambda: {(name,): s['hit_rate'] for name, s in stats.items()}, ('cache',))
+        ]
+
+    def render(self):
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text
+        """
+        lines = []
+        for metric in list(self._metrics.values()) + self._cache_metrics():
+            samples = list(metric.samples())
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self, reset=False):
+        """
+        Returns counter and histogram values as plain, picklable data.
+
+        Args:
+            reset (bool): Zero the values afterwards, so the next snapshot
+                holds only what was recorded in between
+
+        Returns:
+            dict: Metric name to per-series values, for merge()
+        """
+        data = {}
+        for name, metric in list(self._metrics.items()):
+            if isinstance(metric, (Counter, Histogram)):
+                values = metric.snapshot(reset)
+                if values:
+                    data[name] = (metric.kind, metric.documentation, metric.labelnames, values)
+        return data
+
+    def merge(self, snapshot):
+        """
+        Adds a snapshot taken in another process to this registry.
+
+        Args:
+            snapshot (dict): Result of snapshot()
+        """
+        for name, (kind, documentation, labelnames, values) in snapshot.items():
+            if kind == 'histogram':
+                metric = self.histogram(name, documentation, labelnames)
+            else:
+                metric = self.counter(name, documentation, labelnames)
+            metric.merge(values)
+
+    def write(self, path):
+        """
+        Writes the exposition text to a file, replacing it atomically.
+
+        Args:
+            path (str): Destination, e.g. a node_exporter textfile collector .prom file
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+REGISTRY = MetricsRegistry()
+
+ANALYSES = REGISTRY.counter('password_analyses_total', "Passwords analyzed", ('backend',))
+ANALYSIS_SECONDS = REGISTRY.histogram('password_analysis_seconds', "analyze_password latency", ('backend',))
+SCORES = REGISTRY.counter('password_scores_total', "Analyses by score (0-4)", ('backend', 'score'))
+TIERS = REGISTRY.counter('password_tier_total', "Tiered estimates by the tier that settled them", ('tier',))
+APPROXIMATE = REGISTRY.counter('password_approximate_total', "Long passwords estimated within the time budget")
+BREACH_CHECKS = REGISTRY.counter('password_breach_checks_total', "Breach lookups by result", ('result',))
+HISTORY_WRITE_SECONDS = REGISTRY.histogram('password_history_write_seconds', "HistoryStore.append latency")
+
+def record_analysis(analysis, seconds):
+    """
+    Records one analyze_password call.
+
+    Args:
+        analysis (dict): The analysis result
+        seconds (float): Time the analysis took
+    """
+    backend = analysis['backend']
+    ANALYSES.labels(backend).inc()
+    ANALYSIS_SECONDS.labels(backend).observe(seconds)
+    SCORES.labels(backend, str(analysis['score'])).inc()
+    if 'tier' in analysis:
+        TIERS.labels(analysis['tier']).inc()
+    if analysis.get('approximate'):
+        APPROXIMATE.inc()
+
+    breached = analysis['strength_details'].get("Breached passwords")
+    if breached is not None:
+        if breached['pass']:
+            result = 'clean'
+        elif breached['count'] is None:
+            result = 'possible'
+        else:
+            result = 'breached'
+        BREACH_CHECKS.labels(result).inc()
+
+def serve_metrics(port, host='127.0.0.1', registry=REGISTRY):
+    """
+    Serves GET /metrics from a background thread.
+
+    Args:
+        port (int): Port to listen on
+        host (str): Interface to listen on
+        registry (MetricsRegistry): Registry to export
+
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() to stop it)
+    """
+    # Only needed when metrics are served, so kept out of every importer's startup
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    return server
+
+def write_metrics_periodically(path, interval=15.0, registry=REGISTRY):
+    """
+    Rewrites a metrics file every interval seconds from a background thread.
+
+    Args:
+        path (str): Destination file
+        interval (float): Seconds between writes
+        registry (MetricsRegistry): Registry to export
+
+    Returns:
+        threading.Event: Set it to stop writing
+    """
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            registry.write(path)
+
+    threading.Thread(target=loop, name='metrics-writer', daemon=True).start()
+    return stop
@@ -1,36 +1,81 @@
-import re
-import zxcvbn
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
 
-def analyze_password(password):
+from analysis_cache import AnalysisCache
+from breach_check import check_breached
+from estimators import load_zxcvbn, resolve_backend
+from metrics import REGISTRY, record_analysis
+from pattern_matcher import get_default_matcher
+from profiling import StageTimer, current_collector
+from scanner import scan_password
+
+# Shared cache of recent results, keyed by HMAC rather than plaintext
+result_cache = AnalysisCache(max_size=1024)
+REGISTRY.register_cache('result', result_cache)
+
+# Set once warm_up() has built zxcvbn's dictionaries and the pattern matcher
+warmup_ready = threading.Event()
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+def analyze_password(password, timings=False, backend=None):
     """
-    Analyzes a password using zxcvbn and custom criteria.
+    Analyzes a password using a strength estimator and custom criteria.
     
     Args:
         password (str): The password to analyze
+        timings (bool): Include per-stage timings under 'timings'. This is
+            also enabled inside a profiling.profile() block.
+        backend (str): Estimator backend (see estimators.py). Defaults to
+            PASSWORD_ESTIMATOR, or zxcvbn when that isn't set.
         
     Returns:
         dict: Analysis results including score, feedback, and details
     """
-    # Use zxcvbn for comprehensive analysis
-    result = zxcvbn.zxcvbn(password)
+    start = time.perf_counter()
+    collector = current_collector()
+    timer = StageTimer() if timings or collector is not None else None
+    
+    # zxcvbn times its own matching, scoring and feedback steps. Other
+    # backends are timed as one 'estimate' stage and get no timer, so a
+    # zxcvbn call inside them isn't counted again as stages of its own.
+    backend, estimate = resolve_backend(backend)
+    if backend == 'zxcvbn' or timer is None:
+        result = estimate(password, timer)
+    else:
+        with timer.stage('estimate'):
+            result = estimate(password, None)
     
     # Extract relevant information
     score = result['score']  # 0-4, with 4 being the strongest
-    crack_time_seconds = result['crack_times_seconds']['offline_fast_hashing_1e10_per_second']
-    crack_time_display = result['crack_times_display']['offline_fast_hashing_1e10_per_second']
-    warnings = result['feedback']['warning']
-    suggestions = result['feedback']['suggestions']
-    
-    # Perform additional specific checks
-    strength_details = {
-        "Length": check_length(password),
-        "Uppercase letters": check_uppercase(password),
-        "Lowercase letters": check_lowercase(password),
-        "Numbers": check_numbers(password),
-        "Special characters": check_special_chars(password),
-        "Common patterns": check_common_patterns(password),
-        "Repetition": check_repetition(password)
-    }
+    crack_time_seconds = result['crack_time_seconds']
+    crack_time_display = result['crack_time_display']
+    warnings = result['warnings']
+    suggestions = result['suggestions']
+    
+    # Perform additional specific checks from a single scan of the password
+    with _stage(timer, 'checks'):
+        scan = scan_password(password)
+        strength_details = {
+            "Length": check_length(password, scan),
+            "Uppercase letters": check_uppercase(password, scan),
+            "Lowercase letters": check_lowercase(password, scan),
+            "Numbers": check_numbers(password, scan),
+            "Special characters": check_special_chars(password, scan),
+            "Common patterns": check_common_patterns(password, scan),
+            "Repetition": check_repetition(password, scan)
+        }
+    
+    # Only reported when a local breach corpus is configured
+    with _stage(timer, 'breach_check'):
+        breached = check_breached(password)
+    if breached is not None:
+        strength_details["Breached passwords"] = breached
     
     # Format the final analysis
     analysis = {
@@ -40,22 +85,223 @@ def analyze_password(password):
         'warnings': warnings,
         'suggestions': suggestions,
         'strength_details': strength_details,
-        'feedback': generate_feedback(score)
+        'feedback': generate_feedback(score),
+        'backend': backend
     }
     
+    # Backend extras: the tier that settled the password, and whether a long
+    # password was only estimated within the time budget
+    for key in ('tier', 'approximate'):
+        if key in result:
+            analysis[key] = result[key]
+    
+    if timer is not None:
+        analysis['timings'] = timer.timings
+        if collector is not None:
+            collector.record(timer.timings)
+    
+    record_analysis(analysis, time.perf_counter() - start)
     return analysis
 
-def check_length(password):
+def _stage(timer, name):
+    """Time a stage when profiling is on, otherwise do nothing."""
+    return timer.stage(name) if timer is not None else nullcontext()
+
+def warm_up():
+    """
+    Builds zxcvbn's ranked dictionaries and adjacency graphs and the banned-term
+    matcher, then runs one throwaway analysis through every matcher.
+    
+    Everything built here is module-level state, so later calls reuse it.
+    """
+    load_zxcvbn().zxcvbn("warm-up Tr0ub4dor&3 qwerty 1987")
+    get_default_matcher()
+    warmup_ready.set()
+
+def init_worker(warm=False):
+    """
+    Pool initializer for worker processes.
+    
+    Forked workers start with a copy of the parent's metrics, which would be
+    sent back and counted twice with the first chunk, so they are dropped.
+    
+    Args:
+        warm (bool): Also run warm_up() before the first task arrives
+    """
+    REGISTRY.snapshot(reset=True)
+    if warm:
+        warm_up()
+
+def start_warmup():
+    """
+    Starts warm_up() in a background thread, once per process.
+    
+    Returns:
+        threading.Thread: The warm-up thread
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warm_up, name='analyzer-warmup', daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+def is_ready():
+    """
+    Reports whether warm-up has finished.
+    
+    Returns:
+        bool: True once the first analysis no longer pays the setup cost
+    """
+    return warmup_ready.is_set()
+
+def cached_analyze_password(password, cache=None, backend=None):
+    """
+    Analyzes a password, reusing the result of an earlier identical check.
+    
+    Args:
+        password (str): The password to analyze
+        cache (AnalysisCache): Cache to use (defaults to the shared result_cache)
+        backend (str): Estimator backend. Results are cached per backend.
+        
+    Returns:
+        dict: Analysis results. Cached dicts are shared, so treat them as read-only.
+    """
+    cache = result_cache if cache is None else cache
+    backend, _ = resolve_backend(backend)
+    return cache.get_or_analyze(password, lambda password: analyze_password(password, backend=backend), backend)
+
+def analyze_passwords(passwords, workers=None, chunksize=256, cache=None, backend=None):
+    """
+    Analyzes many passwords, spreading the work across a process pool.
+    
+    Args:
+        passwords (iterable): The passwords to analyze
+        workers (int): Number of worker processes (defaults to the CPU count).
+            With a single worker the passwords are analyzed in-process.
+        chunksize (int): Number of passwords sent to a worker at a time
+        cache (AnalysisCache): Optional cache consulted before analyzing
+        backend (str): Estimator backend used for every password
+        
+    Returns:
+        list: One analysis dict per password, in input order. A password
+            whose analysis failed gets {'error': message} instead.
+    """
+    return list(iter_analyze_passwords(passwords, workers=workers, chunksize=chunksize, cache=cache, backend=backend))
+
+def iter_analyze_passwords(passwords, workers=None, chunksize=256, prefetch=2, cache=None, backend=None):
+    """
+    Lazily analyzes a stream of passwords, yielding results in input order.
+    
+    Only a bounded number of chunks is in flight at any time, so memory use
+    does not depend on the length of the input. When a cache is given, cached
+    and repeated passwords are answered without being sent to a worker.
+    
+    Args:
+        passwords (iterable): The passwords to analyze
+        workers (int): Number of worker processes (defaults to the CPU count).
+            With a single worker the passwords are analyzed in-process.
+        chunksize (int): Number of passwords sent to a worker at a time
+        prefetch (int): Chunks queued per worker ahead of the consumer
+        cache (AnalysisCache): Optional cache consulted before analyzing
+        backend (str): Estimator backend used for every password
+        
+    Yields:
+        dict: One analysis dict per password. A password whose analysis
+            failed gets {'error': message} instead, and isn't cached.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    # Resolved here so workers use the same backend as this process
+    backend, _ = resolve_backend(backend)
+    
+    if workers <= 1:
+        for password in passwords:
+            analysis = cache.get(password, backend) if cache is not None else None
+            if analysis is None:
+                analysis = _analyze_or_error(password, backend)
+                if cache is not None and 'error' not in analysis:
+                    cache.put(password, analysis, backend)
+            yield analysis
+        return
+    
+    chunks = _iter_chunks(passwords, max(1, chunksize))
+    max_pending = workers * max(1, prefetch)
+    # Workers time their stages and the totals are merged here
+    collector = current_collector()
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(_submit_chunk(executor, chunk, cache, backend, collector is not None))
+            if len(pending) >= max_pending:
+                yield from _collect_chunk(pending.popleft(), cache, backend, collector)
+        while pending:
+            yield from _collect_chunk(pending.popleft(), cache, backend, collector)
+
+def _iter_chunks(iterable, size):
+    """Split an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _submit_chunk(executor, chunk, cache, backend, timings=False):
+    """Send the uncached, de-duplicated passwords of a chunk to the pool."""
+    results = [None] * len(chunk)
+    misses = {}
+    for index, password in enumerate(chunk):
+        analysis = cache.get(password, backend) if cache is not None else None
+        if analysis is None:
+            misses.setdefault(password, []).append(index)
+        else:
+            results[index] = analysis
+    future = executor.submit(_analyze_chunk, list(misses), backend, timings) if misses else None
+    return results, misses, future
+
+def _collect_chunk(submitted, cache, backend, collector=None):
+    """Wait for a submitted chunk and merge worker results back in order."""
+    results, misses, future = submitted
+    if future is not None:
+        analyses, metrics = future.result()
+        REGISTRY.merge(metrics)
+        for (password, indexes), analysis in zip(misses.items(), analyses):
+            if 'error' not in analysis:
+                if collector is not None:
+                    collector.record(analysis['timings'])
+                if cache is not None:
+                    cache.put(password, analysis, backend)
+            for index in indexes:
+                results[index] = analysis
+    return results
+
+def _analyze_chunk(passwords, backend, timings=False):
+    """Analyze a list of passwords inside a worker process, returning its metrics too."""
+    analyses = [_analyze_or_error(password, backend, timings) for password in passwords]
+    return analyses, REGISTRY.snapshot(reset=True)
+
+def _analyze_or_error(password, backend, timings=False):
+    """Analyze one password of a batch, turning a failure into an error record so the batch goes on."""
+    try:
+        return analyze_password(password, timings, backend)
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+def check_length(password, scan=None):
     """Check if password meets minimum length requirements."""
+    scan = scan or scan_password(password)
     min_length = 8
     recommended_length = 12
     
-    if len(password) < min_length:
+    if scan.length < min_length:
         return {
             'pass': False,
             'message': f"Password is too short (minimum {min_length} characters)"
         }
-    elif len(password) < recommended_length:
+    elif scan.length < recommended_length:
         return {
             'pass': True,
             'message': f"Password meets minimum length, but {recommended_length}+ characters is recommended"
@@ -66,9 +312,10 @@ def check_length(password):
             'message': "Password has good length"
         }
 
-def check_uppercase(password):
+def check_uppercase(password, scan=None):
     """Check if password contains uppercase letters."""
-    if re.search(r'[A-Z]', password):
+    scan = scan or scan_password(password)
+    if scan.uppercase:
         return {
             'pass': True,
             'message': "Contains uppercase letters"
@@ -79,9 +326,10 @@ def check_uppercase(password):
             'message': "No uppercase letters found"
         }
 
-def check_lowercase(password):
+def check_lowercase(password, scan=None):
     """Check if password contains lowercase letters."""
-    if re.search(r'[a-z]', password):
+    scan = scan or scan_password(password)
+    if scan.lowercase:
         return {
             'pass': True,
             'message': "Contains lowercase letters"
@@ -92,9 +340,10 @@ def check_lowercase(password):
             'message': "No lowercase letters found"
         }
 
-def check_numbers(password):
+def check_numbers(password, scan=None):
     """Check if password contains numbers."""
-    if re.search(r'\d', password):
+    scan = scan or scan_password(password)
+    if scan.digits:
         return {
             'pass': True,
             'message': "Contains numbers"
@@ -105,9 +354,10 @@ def check_numbers(password):
             'message': "No numbers found"
         }
 
-def check_special_chars(password):
+def check_special_chars(password, scan=None):
     """Check if password contains special characters."""
-    if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    scan = scan or scan_password(password)
+    if scan.special:
         return {
             'pass': True,
             'message': "Contains special characters"
@@ -118,26 +368,25 @@ def check_special_chars(password):
             'message': "No special characters found"
         }
 
-def check_common_patterns(password):
+def check_common_patterns(password, scan=None):
     """Check for common patterns like sequences or keyboard patterns."""
-    common_sequences = ['123', 'abc', 'qwerty', 'password', 'admin']
-    lower_password = password.lower()
-    
-    for seq in common_sequences:
-        if seq in lower_password:
-            return {
-                'pass': False,
-                'message': "Contains common patterns or sequences"
-            }
+    scan = scan or scan_password(password)
+    if scan.patterns:
+        return {
+            'pass': False,
+            'message': f"Contains common patterns or sequences: {', '.join(scan.patterns)}",
+            'matches': list(scan.patterns)
+        }
     
     return {
         'pass': True,
         'message': "No obvious patterns detected"
     }
 
-def check_repetition(password):
+def check_repetition(password, scan=None):
     """Check for character repetition."""
-    if re.search(r'(.)\1{2,}', password):  # Same character repeated 3+ times
+    scan = scan or scan_password(password)
+    if scan.max_run >= 3:  # Same character repeated 3+ times
         return {
             'pass': False,
             'message': "Contains repeated characters"
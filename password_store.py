@@ -0,0 +1,179 @@
+"""
+Hashed store of previously checked passwords.
+
+Only salted HMAC-SHA256 digests are kept, in an insertion-ordered index with
+O(1) membership checks and a size bound (the oldest entries are evicted
+first). Persistence is an append-only log: each new password costs one
+short append, and the log is compacted once it holds many more records than
+live entries.
+
+Several processes can share one log. Creating it, appending and compacting
+hold an exclusive lock on a sidecar .lock file, and compaction re-reads the
+log first so records other processes appended survive it. Each process only
+sees other processes' records once it reloads the log. Without fcntl (on
+Windows) there is no file lock, so the store is then safe for one process
+only.
+"""
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SALT_PREFIX = 'salt '
+
+class UsedPasswordStore:
+    """
+    Bounded set of password digests backed by an append-only log file.
+
+    Args:
+        path (str): Log file to persist to, or None to keep the store in memory
+        max_entries (int): Maximum number of digests kept before the oldest
+            are evicted
+        legacy_path (str): Plaintext JSON list from older versions, or None.
+            Its passwords are imported as digests and the file is emptied.
+    """
+
+    def __init__(self, path='.used_passwords.log', max_entries=100000, legacy_path=None):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._log_records = 0
+        self._lock = threading.Lock()
+        self._salt = None
+
+        # Two processes creating the log at once must agree on one salt
+        with self._file_lock():
+            if path:
+                self._load()
+            if self._salt is None:
+                self._reset_log()
+        if legacy_path:
+            self._import_legacy(legacy_path)
+
+    def _digest(self, password):
+        return hmac.new(self._salt, password.encode('utf-8', 'surrogatepass'), hashlib.sha256).digest()
+
+    @contextmanager
+    def _file_lock(self):
+        """Holds the exclusive lock on the log, across processes where fcntl is available."""
+        if not self.path or fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        """Replaces the in-memory state with the log's; leaves no salt if the log is missing or unreadable."""
+        self._salt = None
+        self._entries.clear()
+        self._log_records = 0
+        try:
+            with open(self.path, 'r', encoding='ascii') as f:
+                header = f.readline().strip()
+                if not header.startswith(SALT_PREFIX):
+                    return
+                self._salt = bytes.fromhex(header[len(SALT_PREFIX):])
+                for line in f:
+                    line = line.strip()
+                    # A torn final line from a crash is simply skipped
+                    if len(line) != 64:
+                        continue
+                    self._remember(bytes.fromhex(line))
+                    self._log_records += 1
+        except (FileNotFoundError, ValueError):
+            self._salt = None
+            self._entries.clear()
+            self._log_records = 0
+
+    def _import_legacy(self, legacy_path):
+        try:
+            with open(legacy_path, 'r') as f:
+                passwords = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if not passwords:
+            return
+        for password in passwords:
+            self.add(password)
+        # Drop the plaintext copies now that their digests are stored
+        with open(legacy_path, 'w') as f:
+            json.dump([], f)
+
+    def _remember(self, digest):
+        self._entries[digest] = None
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _append(self, lines):
+        if self.path:
+            with self._file_lock(), open(self.path, 'a', encoding='ascii') as f:
+                f.write(''.join(lines))
+
+    def _reset_log(self):
+        self._salt = secrets.token_bytes(16)
+        self._rewrite()
+
+    def _rewrite(self):
+        """Write the live entries to a fresh log and atomically swap it in."""
+        self._log_records = len(self._entries)
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='ascii') as f:
+            f.write(f"{SALT_PREFIX}{self._salt.hex()}\n")
+            f.writelines(f"{digest.hex()}\n" for digest in self._entries)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def add(self, password):
+        """
+        Records a password as used.
+
+        Args:
+            password (str): The password to record
+        """
+        digest = self._digest(password)
+        with self._lock:
+            self._remember(digest)
+            self._append([f"{digest.hex()}\n"])
+            self._log_records += 1
+            # Compact once most of the log is evicted or duplicate records
+            if self._log_records > 2 * max(len(self._entries), 1024):
+                self._compact()
+
+    def _compact(self):
+        """Rewrites the log with its live entries, including other processes' records."""
+        with self._file_lock():
+            if self.path:
+                self._load()
+            if self._salt is None:
+                self._reset_log()
+            else:
+                self._rewrite()
+
+    def clear(self):
+        """Forgets all recorded passwords and rotates the salt."""
+        with self._lock, self._file_lock():
+            self._entries.clear()
+            self._reset_log()
+
+    def __contains__(self, password):
+        return self._digest(password) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,153 @@
+"""
+Aho-Corasick multi-pattern matcher for banned substrings.
+
+The automaton is built once from the configured word lists and then finds
+every banned term in a single pass over the password, however many terms
+the lists contain. Short lists, such as the built-in sequences alone, are
+searched term by term instead, which is faster below MAX_SUBSTRING_TERMS.
+Matching is case-insensitive.
+"""
+import os
+import threading
+from collections import deque
+
+# Built-in sequences that are always banned
+COMMON_SEQUENCES = ['123', 'abc', 'qwerty', 'password', 'admin']
+
+# Up to this many terms, one substring search per term (in C) beats walking
+# the automaton in Python, so the automaton is only used for longer lists
+MAX_SUBSTRING_TERMS = 32
+
+# Word list files to load by default, separated by os.pathsep
+BANNED_WORDS_ENV = 'PASSWORD_BANNED_WORDS'
+
+class PatternMatcher:
+    """
+    Aho-Corasick automaton over a set of banned terms.
+
+    Args:
+        words (iterable): Terms to match. Blank entries are ignored.
+    """
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self.words = set()
+
+        for word in words:
+            word = word.strip().lower()
+            if word:
+                self._add(word)
+        self._build_failure_links()
+        self._terms = sorted(self.words) if len(self.words) <= MAX_SUBSTRING_TERMS else None
+
+    def _add(self, word):
+        self.words.add(word)
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = (word,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit the terms that end at the failure target
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find_all(self, text):
+        """
+        Finds every banned term that occurs in the text.
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            list: Distinct matched terms, sorted
+        """
+        text = text.lower()
+        if self._terms is not None:
+            return [term for term in self._terms if term in text]
+
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return sorted(found)
+
+    def __len__(self):
+        return len(self.words)
+
+def load_word_list(path):
+    """
+    Reads banned terms from a file, one per line.
+
+    Blank lines and lines starting with '#' are skipped.
+
+    Args:
+        path (str): Path of the word list
+
+    Returns:
+        list: The terms in the file
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+_default_matcher = None
+_default_lock = threading.Lock()
+
+def configure_banned_words(word_lists=(), words=()):
+    """
+    Rebuilds the shared matcher from the built-in sequences plus extra terms.
+
+    Args:
+        word_lists (iterable): Paths of word list files to load
+        words (iterable): Additional terms, such as product or company names
+
+    Returns:
+        PatternMatcher: The new shared matcher
+    """
+    global _default_matcher
+    terms = list(COMMON_SEQUENCES)
+    for path in word_lists:
+        terms.extend(load_word_list(path))
+    terms.extend(words)
+
+    matcher = PatternMatcher(terms)
+    with _default_lock:
+        _default_matcher = matcher
+    return matcher
+
+def get_default_matcher():
+    """
+    Returns the shared matcher, building it on first use.
+
+    The word lists named in the PASSWORD_BANNED_WORDS environment variable are
+    loaded when the matcher is first built.
+
+    Returns:
+        PatternMatcher: The shared matcher
+    """
+    if _default_matcher is None:
+        paths = [path for path in os.environ.get(BANNED_WORDS_ENV, '').split(os.pathsep) if path]
+        configure_banned_words(paths)
+    return _default_matcher
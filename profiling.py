@@ -0,0 +1,137 @@
+"""
+Opt-in per-stage timing for analyze_password.
+
+Wrap calls in `profile()` (or pass timings=True to analyze_password) to get
+wall time and net allocated memory blocks for each stage: zxcvbn matching,
+zxcvbn scoring, zxcvbn feedback, the custom checks and the breach lookup.
+Per-call numbers are returned in the analysis under 'timings', and a
+TimingCollector aggregates them across calls so bulk runs can dump totals.
+"""
+import contextvars
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_active_collector = contextvars.ContextVar('password_timing_collector', default=None)
+
+class StageTimer:
+    """Records the stages of a single analysis."""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times the enclosed block as one stage.
+
+        Args:
+            name (str): Stage name
+        """
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = {
+                'seconds': time.perf_counter() - start,
+                'allocated_blocks': sys.getallocatedblocks() - blocks
+            }
+
+class TimingCollector:
+    """
+    Thread-safe aggregate of stage timings across many analyses.
+
+    Callbacks registered with add_callback are called with the per-call
+    timings dict after every recorded analysis.
+    """
+
+    def __init__(self):
+        self.analyses = 0
+        self.stages = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """
+        Registers a function called with each analysis' timings dict.
+
+        Args:
+            callback (callable): Function taking the timings dict
+        """
+        self._callbacks.append(callback)
+
+    def record(self, timings):
+        """
+        Adds one analysis' timings to the totals.
+
+        Args:
+            timings (dict): Stage name to {'seconds', 'allocated_blocks'}
+        """
+        with self._lock:
+            self.analyses += 1
+            for name, stage in timings.items():
+                totals = self.stages.setdefault(name, {
+                    'calls': 0,
+                    'total_seconds': 0.0,
+                    'max_seconds': 0.0,
+                    'allocated_blocks': 0
+                })
+                totals['calls'] += 1
+                totals['total_seconds'] += stage['seconds']
+                totals['max_seconds'] = max(totals['max_seconds'], stage['seconds'])
+                totals['allocated_blocks'] += stage['allocated_blocks']
+        for callback in self._callbacks:
+            callback(timings)
+
+    def summary(self):
+        """
+        Returns the aggregated timings.
+
+        Returns:
+            dict: Number of analyses and per-stage totals, maxima and means
+        """
+        with self._lock:
+            stages = {}
+            for name, totals in self.stages.items():
+                stages[name] = dict(totals, mean_seconds=totals['total_seconds'] / totals['calls'])
+            return {'analyses': self.analyses, 'stages': stages}
+
+    def dump(self, path):
+        """
+        Writes the summary to a JSON file.
+
+        Args:
+            path (str): Destination file
+        """
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+@contextmanager
+def profile(collector=None):
+    """
+    Enables stage timing for analyses run inside the block.
+
+    Args:
+        collector (TimingCollector): Collector to aggregate into (a new one by default)
+
+    Yields:
+        TimingCollector: The active collector
+    """
+    collector = collector or TimingCollector()
+    token = _active_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _active_collector.reset(token)
+
+def current_collector():
+    """
+    Returns the collector enabled by the innermost profile() block.
+
+    Returns:
+        TimingCollector: The active collector, or None when profiling is off
+    """
+    return _active_collector.get()
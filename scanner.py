@@ -0,0 +1,111 @@
+"""
+Single-pass character scanner shared by the analyzer and the real-time UI.
+
+Computes character-class counts, the longest run of a repeated character and
+banned-term hits in a few passes over the password that each run in C,
+instead of one regex search per criterion.
+"""
+import re
+from collections import namedtuple
+
+from pattern_matcher import get_default_matcher
+
+# Characters accepted by the "Special characters" criterion
+SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+PasswordScan = namedtuple('PasswordScan', [
+    'length',     # Number of characters
+    'uppercase',  # ASCII uppercase letters
+    'lowercase',  # ASCII lowercase letters
+    'digits',     # Decimal digits
+    'special',    # Characters from SPECIAL_CHARACTERS
+    'symbols',    # Any non-alphanumeric character, including spaces
+    'max_run',    # Longest run of one repeated character
+    'patterns',   # Common sequences and banned terms found (case-insensitive)
+    'any_upper',  # Whether any letter is uppercase, including non-ASCII ones
+    'any_lower'   # Whether any letter is lowercase, including non-ASCII ones
+])
+
+_UPPER, _LOWER, _DIGIT, _SPECIAL, _SYMBOL, _OTHER = 'ULDPSO'
+
+# A repeated character, and runs of two or more of one character
+_PAIR = re.compile(r'(.)\1', re.DOTALL)
+_RUNS = re.compile(r'(.)\1+', re.DOTALL)
+
+# Distinct non-ASCII characters remembered by the class table
+_MAX_CLASS_TABLE = 4096
+
+def _classify(char):
+    if 'A' <= char <= 'Z':
+        return _UPPER
+    if 'a' <= char <= 'z':
+        return _LOWER
+    if char.isdecimal():
+        return _DIGIT
+    if char in SPECIAL_CHARACTERS:
+        return _SPECIAL
+    if not char.isalnum():
+        return _SYMBOL
+    return _OTHER
+
+class _ClassTable(dict):
+    """str.translate table from code points to class codes, extended as new characters are seen."""
+
+    def __missing__(self, code):
+        char_class = _classify(chr(code))
+        if len(self) < _MAX_CLASS_TABLE:
+            self[code] = char_class
+        return char_class
+
+# Precomputed classes for ASCII; anything else is classified on first sight
+_CLASS_TABLE = _ClassTable((code, _classify(chr(code))) for code in range(128))
+
+# bytes.translate table for ASCII passwords, much cheaper than a dict lookup per character
+_ASCII_CLASSES = ''.join(_CLASS_TABLE[code] for code in range(128)).encode('ascii').ljust(256, b'?')
+
+def scan_password(password):
+    """
+    Scans a password once and collects everything the strength checks need.
+
+    Characters are mapped to their class codes with translate() and the codes
+    counted with str.count, and repeated runs are found by a regex, so the
+    work per character happens in C rather than in a Python loop.
+
+    Args:
+        password (str): The password to scan
+
+    Returns:
+        PasswordScan: Character-class counts, longest run and pattern hits
+    """
+    if password.isascii():
+        classes = password.encode('ascii').translate(_ASCII_CLASSES).decode('ascii')
+    else:
+        classes = password.translate(_CLASS_TABLE)
+    special = classes.count(_SPECIAL)
+    max_run = min(len(password), 1)
+    pair = _PAIR.search(password)
+    if pair is not None:
+        max_run = max(match.end() - match.start() for match in _RUNS.finditer(password, pair.start()))
+    patterns = tuple(get_default_matcher().find_all(password))
+
+    uppercase = classes.count(_UPPER)
+    lowercase = classes.count(_LOWER)
+    any_upper, any_lower = uppercase > 0, lowercase > 0
+    # Non-ASCII letters are only classified as other, so look at their case
+    # separately for the real-time feedback, and only when it could matter
+    if (not any_upper or not any_lower) and _OTHER in classes:
+        any_upper = any_upper or any(char.isupper() for char in password)
+        any_lower = any_lower or any(char.islower() for char in password)
+
+    return PasswordScan(
+        length=len(password),
+        uppercase=uppercase,
+        lowercase=lowercase,
+        digits=classes.count(_DIGIT),
+        special=special,
+        symbols=special + classes.count(_SYMBOL),
+        max_run=max_run,
+        patterns=patterns,
+        any_upper=any_upper,
+        any_lower=any_lower
+    )
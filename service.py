@@ -0,0 +1,601 @@
+"""
+Asynchronous HTTP/JSON analysis service.
+
+Lets other services call the analyzer over HTTP. Requests are parsed on an
+asyncio event loop, and the CPU-bound scoring runs in a process pool (or a
+thread pool). Connections are kept alive between requests. Identical
+passwords already being analyzed are coalesced into a single analysis, and
+recent results are served from an HMAC-keyed cache.
+
+With admission control enabled, at most --max-concurrent requests wait on
+the pool at once and --max-queue more may queue. Requests beyond that are
+answered immediately with a heuristic estimate marked 'degraded'. Clients
+over their --rate limit get 429 responses. Cache hits and coalesced
+requests never take a slot. Clients are told apart by address; behind a
+trusted proxy, --trust-client-id uses the X-Client-Id header instead.
+
+Endpoints:
+    POST /analyze        {"password": "...", "backend": "zxcvbn"}  -> analysis
+    POST /analyze/batch  {"passwords": ["...", ...], "backend": ...} -> {"results": [...]}
+    GET  /health         -> {"status": "ok", "ready": true once warm-up has finished}
+    GET  /stats          -> request, coalescing and cache counters
+    GET  /metrics        -> Prometheus text format
+
+Usage:
+    python service.py --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from admission import AdmissionController, Overloaded, RateLimited
+from analysis_cache import AnalysisCache
+from estimators import available_backends, resolve_backend
+from metrics import CONTENT_TYPE, REGISTRY
+from password_analyzer import analyze_password, init_worker, is_ready, start_warmup
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    429: 'Too Many Requests',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+    501: 'Not Implemented'
+}
+
+MAX_HEADERS = 100
+
+ENDPOINTS = ('/analyze', '/analyze/batch', '/health', '/stats', '/metrics')
+
+REQUESTS = REGISTRY.counter('password_service_requests_total', "HTTP requests by endpoint and status", ('path', 'status'))
+REQUEST_SECONDS = REGISTRY.histogram('password_service_request_seconds', "HTTP request latency by endpoint", ('path',))
+DEGRADED = REGISTRY.counter('password_service_degraded_total', "Passwords answered with a degraded heuristic result")
+COALESCED = REGISTRY.counter('password_service_coalesced_total', "Passwords that waited on another request's analysis")
+
+class HTTPError(Exception):
+    """Error reported to the client with an HTTP status and JSON message."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+def _analyze_batch(passwords, backend, export_metrics=False):
+    """Analyze a list of passwords inside a pool worker, returning its metrics too."""
+    analyses = [analyze_password(password, backend=backend) for password in passwords]
+    # A worker process sends what it recorded back to be merged; threads
+    # already record into the service's registry
+    return analyses, REGISTRY.snapshot(reset=True) if export_metrics else None
+
+class AnalysisService:
+    """
+    Coalescing front end to a pool of analyzer workers.
+
+    Args:
+        workers (int): Pool size (defaults to the CPU count)
+        executor (str): 'process' for a process pool, 'thread' for a thread pool
+        chunksize (int): Passwords of a batch sent to a worker at a time
+        cache (AnalysisCache): Result cache (a 10,000-entry cache by default)
+        max_batch (int): Most passwords accepted in one batch request
+        max_body (int): Largest request body accepted, in bytes
+        keep_alive_timeout (float): Seconds an idle connection is kept open
+        admission (AdmissionController): Concurrency and rate limits, or None
+            to queue every request
+        trust_client_id (bool): Rate-limit by the X-Client-Id header rather
+            than the peer address. Only safe behind a proxy that sets it.
+    """
+
+    def __init__(self, workers=None, executor='process', chunksize=64, cache=None,
+                 max_batch=1000, max_body=1 << 20, keep_alive_timeout=15.0, admission=None,
+                 trust_client_id=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor_type = executor
+        self.chunksize = max(1, chunksize)
+        self.cache = AnalysisCache(max_size=10000) if cache is None else cache
+        self.max_batch = max_batch
+        self.max_body = max_body
+        self.keep_alive_timeout = keep_alive_timeout
+        self.admission = admission
+        self.trust_client_id = trust_client_id
+        self.executor = None
+        self._warmups = []
+        self.requests = 0
+        self.analyzed = 0
+        self.coalesced = 0
+        self.degraded = 0
+        self.connections = 0
+        self._inflight = {}
+        self._tasks = set()
+
+        REGISTRY.register_cache('service', self.cache)
+        REGISTRY.gauge_function('password_service_in_flight', "Passwords being analyzed in the pool",
+                                lambda: {(): len(self._inflight)})
+        if admission is not None:
+            REGISTRY.gauge_function('password_admission_active', "Requests holding an analysis slot",
+                                    lambda: {(): admission.active})
+            REGISTRY.gauge_function('password_admission_queue_depth', "Requests waiting for an analysis slot",
+                                    lambda: {(): admission.queue_depth})
+            REGISTRY.gauge_function('password_admission_rejections_total', "Requests rejected by admission control",
+                                    lambda: {('shed',): admission.shed, ('timed_out',): admission.timed_out,
+                                             ('rate_limited',): admission.rate_limited},
+                                    ('reason',), 'counter')
+
+    def start(self):
+        """Starts the worker pool and warms up the analyzer in every worker."""
+        if self.executor_type == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='analyzer')
+            start_warmup()
+        else:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(True,))
+            # Workers warm up in their initializer before taking a task, so
+            # these finish once the pool has started and warmed up
+            self._warmups = [self.executor.submit(is_ready) for _ in range(self.workers)]
+
+    def is_ready(self):
+        """
+        Reports whether the analyzer has warmed up.
+
+        Returns:
+            bool: True once analyses no longer pay zxcvbn's setup cost
+        """
+        if self.executor_type == 'thread':
+            return is_ready()
+        return self.executor is not None and all(future.done() for future in self._warmups)
+
+    def close(self):
+        """Shuts the worker pool down."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+            self._warmups = []
+
+    async def analyze(self, password, backend=None):
+        """
+        Analyzes one password.
+
+        Args:
+            password (str): The password to analyze
+            backend (str): Estimator backend, or None for the default
+
+        Returns:
+            dict: Analysis results. Shared with other callers, so treat as read-only.
+        """
+        results = await self.analyze_batch([password], backend)
+        return results[0]
+
+    async def analyze_batch(self, passwords, backend=None):
+        """
+        Analyzes a list of passwords, in order.
+
+        Cached passwords are answered immediately, passwords already being
+        analyzed for another request wait for that analysis, and the rest is
+        split into chunks and sent to the pool. Only requests with new work
+        for the pool go through admission control.
+
+        Args:
+            passwords (list): The passwords to analyze
+            backend (str): Estimator backend, or None for the default
+
+        Returns:
+            list: One analysis dict per password
+
+        Raises:
+            Overloaded: Admission control shed the request
+        """
+        backend, _ = resolve_backend(backend)
+        keys = [self.cache.key(password, backend) for password in passwords]
+
+        results = {}
+        pending = {}
+        misses = {}
+        for key, password in zip(keys, passwords):
+            if key in results or key in pending or key in misses:
+                continue
+            analysis = self.cache.get(password, backend)
+            if analysis is not None:
+                results[key] = analysis
+            elif key in self._inflight:
+                pending[key] = self._inflight[key]
+                self.coalesced += 1
+                COALESCED.inc()
+            else:
+                misses[key] = password
+
+        if misses and self.admission is not None:
+            async with self.admission.slot():
+                self._submit(misses, backend, pending)
+                await self._wait(pending, results)
+        else:
+            self._submit(misses, backend, pending)
+            await self._wait(pending, results)
+
+        return [results[key] for key in keys]
+
+    def _submit(self, misses, backend, pending):
+        """Register in-flight futures for new passwords and send them to the pool in chunks."""
+        loop = asyncio.get_running_loop()
+        submit = []
+        for key, password in misses.items():
+            # Another request may have started on it while this one queued
+            if key in self._inflight:
+                pending[key] = self._inflight[key]
+                self.coalesced += 1
+                COALESCED.inc()
+                continue
+            future = loop.create_future()
+            self._inflight[key] = future
+            pending[key] = future
+            submit.append((key, password))
+
+        items = iter(submit)
+        while True:
+            chunk = list(islice(items, self.chunksize))
+            if not chunk:
+                break
+            task = asyncio.create_task(self._run_chunk(chunk, backend))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _wait(pending, results):
+        """Wait for in-flight analyses and add them to results."""
+        # Shielded so a client disconnecting doesn't cancel an analysis other
+        # requests are waiting on
+        if pending:
+            await asyncio.gather(*(asyncio.shield(future) for future in pending.values()))
+            for key, future in pending.items():
+                results[key] = future.result()
+
+    def degraded_batch(self, passwords):
+        """
+        Cheap heuristic results for requests shed under load.
+
+        Args:
+            passwords (list): The passwords to estimate
+
+        Returns:
+            list: One analysis dict per password, marked 'degraded'
+        """
+        self.degraded += len(passwords)
+        DEGRADED.inc(len(passwords))
+        return [dict(analyze_password(password, backend='heuristic'), degraded=True) for password in passwords]
+
+    async def admitted_batch(self, passwords, backend=None, client=None):
+        """
+        analyze_batch behind the client's rate limit, degrading when shed.
+
+        Args:
+            passwords (list): The passwords to analyze
+            backend (str): Estimator backend, or None for the default
+            client (str): Client identifier for rate limiting
+
+        Returns:
+            list: One analysis dict per password
+
+        Raises:
+            HTTPError: 429 when the client is over its rate limit
+        """
+        if self.admission is not None:
+            try:
+                self.admission.check_rate(client, len(passwords))
+            except RateLimited as error:
+                retry_after = max(1, int(error.retry_after + 0.999))
+                raise HTTPError(429, str(error), {'Retry-After': str(retry_after)}) from None
+        try:
+            return await self.analyze_batch(passwords, backend)
+        except Overloaded:
+            return self.degraded_batch(passwords)
+
+    async def _run_chunk(self, chunk, backend):
+        """Analyze a chunk in the pool and resolve its in-flight futures."""
+        loop = asyncio.get_running_loop()
+        passwords = [password for _, password in chunk]
+        try:
+            analyses, metrics = await loop.run_in_executor(
+                self.executor, _analyze_batch, passwords, backend, self.executor_type == 'process'
+            )
+        except Exception as error:
+            for key, _ in chunk:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        if metrics:
+            REGISTRY.merge(metrics)
+        self.analyzed += len(analyses)
+        for (key, password), analysis in zip(chunk, analyses):
+            self.cache.put(password, analysis, backend)
+            future = self._inflight.pop(key)
+            if not future.done():
+                future.set_result(analysis)
+
+    def stats(self):
+        """
+        Returns service counters.
+
+        Returns:
+            dict: Requests, analyses, coalesced lookups, connections and cache stats
+        """
+        stats = {
+            'requests': self.requests,
+            'analyzed': self.analyzed,
+            'coalesced': self.coalesced,
+            'degraded': self.degraded,
+            'in_flight': len(self._inflight),
+            'connections': self.connections,
+            'workers': self.workers,
+            'executor': self.executor_type,
+            'cache': self.cache.stats()
+        }
+        if self.admission is not None:
+            stats['admission'] = self.admission.stats()
+        return stats
+
+    async def dispatch(self, method, path, body, client=None):
+        """
+        Routes a request to its endpoint.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path without the query string
+            body (bytes): Request body
+            client (str): Client identifier for rate limiting
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable payload, or str for plain text)
+        """
+        if path == '/health':
+            self._require_method(method, 'GET')
+            return 200, {'status': 'ok', 'ready': self.is_ready()}
+        if path == '/stats':
+            self._require_method(method, 'GET')
+            return 200, self.stats()
+        if path == '/metrics':
+            self._require_method(method, 'GET')
+            return 200, REGISTRY.render()
+        if path == '/analyze':
+            self._require_method(method, 'POST')
+            request = self._parse_json(body)
+            password = request.get('password')
+            if not isinstance(password, str):
+                raise HTTPError(400, "'password' must be a string")
+            results = await self.admitted_batch([password], self._backend(request), client)
+            return 200, results[0]
+        if path == '/analyze/batch':
+            self._require_method(method, 'POST')
+            request = self._parse_json(body)
+            passwords = request.get('passwords')
+            if not isinstance(passwords, list) or not all(isinstance(password, str) for password in passwords):
+                raise HTTPError(400, "'passwords' must be a list of strings")
+            if len(passwords) > self.max_batch:
+                raise HTTPError(413, f"At most {self.max_batch} passwords per batch")
+            return 200, {'results': await self.admitted_batch(passwords, self._backend(request), client)}
+        raise HTTPError(404, f"No such endpoint: {path}")
+
+    @staticmethod
+    def _require_method(method, allowed):
+        if method != allowed:
+            raise HTTPError(405, f"Use {allowed}")
+
+    @staticmethod
+    def _parse_json(body):
+        try:
+            request = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HTTPError(400, "Request body must be JSON") from None
+        if not isinstance(request, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return request
+
+    @staticmethod
+    def _backend(request):
+        backend = request.get('backend')
+        if backend is not None and backend not in available_backends():
+            raise HTTPError(400, f"Unknown backend {backend!r}; choose from {', '.join(available_backends())}")
+        return backend
+
+    async def handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests on one connection until it closes."""
+        self.connections += 1
+        peer = writer.get_extra_info('peername')
+        peer_host = peer[0] if peer else None
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+
+                keep_alive = False
+                extra_headers = {}
+                path = None
+                start = time.perf_counter()
+                try:
+                    method, target, version, headers = await self._read_head(request_line, reader)
+                    keep_alive = self._keep_alive(version, headers)
+                    body = await self._read_body(headers, reader)
+                    self.requests += 1
+                    # Any caller could pick a fresh id per request, so the header
+                    # is only believed when a trusted proxy sets it
+                    client = peer_host
+                    if self.trust_client_id:
+                        client = headers.get('x-client-id') or peer_host
+                    path = target.split('?', 1)[0]
+                    status, payload = await self.dispatch(method, path, body, client)
+                except HTTPError as error:
+                    status, payload = error.status, {'error': error.message}
+                    extra_headers = error.headers
+                    # The rest of a rejected request can't be skipped reliably
+                    if error.status in (413, 431, 501):
+                        keep_alive = False
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                except Exception as error:
+                    status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+
+                writer.write(self._response(status, payload, keep_alive, extra_headers))
+                endpoint = path if path in ENDPOINTS else 'other'
+                REQUESTS.labels(endpoint, str(status)).inc()
+                REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - start)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_head(self, request_line, reader):
+        """Parse the request line and headers."""
+        try:
+            method, target, version = request_line.decode('latin-1').rstrip('\r\n').split(' ')
+        except ValueError:
+            raise HTTPError(400, "Malformed request line") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HTTPError(431, "Too many headers")
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return method, target, version, headers
+
+    async def _read_body(self, headers, reader):
+        """Read a Content-Length delimited body."""
+        if 'transfer-encoding' in headers:
+            raise HTTPError(501, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length") from None
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body:
+            raise HTTPError(413, f"Request body larger than {self.max_body} bytes")
+        return await reader.readexactly(length) if length else b''
+
+    @staticmethod
+    def _keep_alive(version, headers):
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.1':
+            return connection != 'close'
+        return connection == 'keep-alive'
+
+    @staticmethod
+    def _response(status, payload, keep_alive, extra_headers=None):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), CONTENT_TYPE
+        else:
+            body, content_type = json.dumps(payload, default=float).encode('utf-8'), 'application/json'
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "Cache-Control: no-store\r\n"
+        )
+        for name, value in (extra_headers or {}).items():
+            head += f"{name}: {value}\r\n"
+        return (head + "\r\n").encode('latin-1') + body
+
+async def serve(service, host='127.0.0.1', port=8080, ready=None):
+    """
+    Runs the service until cancelled.
+
+    Args:
+        service (AnalysisService): The service to expose
+        host (str): Interface to listen on
+        port (int): Port to listen on (0 picks a free port)
+        ready (callable): Called with the bound (host, port) once listening
+    """
+    # SIGTERM shuts down like Ctrl-C, so pool workers aren't left orphaned
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
+
+    service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    try:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve password analysis over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Pool size (default: CPU count)")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process', help="Worker pool type")
+    parser.add_argument('--chunksize', type=int, default=64, help="Batch passwords sent to a worker at a time")
+    parser.add_argument('--cache-size', type=int, default=10000, help="Results kept in the cache (0 disables)")
+    parser.add_argument('--max-batch', type=int, default=1000, help="Most passwords per batch request")
+    parser.add_argument('--keep-alive', type=float, default=15.0, help="Seconds an idle connection stays open")
+    parser.add_argument('--max-concurrent', type=int, default=None,
+                        help="Requests waiting on the pool at once (default: 2 per worker; 0 disables admission control)")
+    parser.add_argument('--max-queue', type=int, default=64, help="Requests queued for a slot before shedding to a degraded result")
+    parser.add_argument('--queue-timeout', type=float, default=1.0, help="Seconds a request may queue before it is shed")
+    parser.add_argument('--rate', type=float, default=None, help="Per-client passwords per second (default: unlimited)")
+    parser.add_argument('--burst', type=float, default=None, help="Per-client burst size (default: the rate)")
+    parser.add_argument('--trust-client-id', action='store_true',
+                        help="Rate-limit by the X-Client-Id header (only behind a proxy that sets it)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    max_concurrent = 2 * workers if args.max_concurrent is None else args.max_concurrent
+    admission = None
+    if max_concurrent > 0:
+        admission = AdmissionController(
+            max_concurrent=max_concurrent,
+            max_queue=args.max_queue,
+            queue_timeout=args.queue_timeout,
+            rate=args.rate,
+            burst=args.burst
+        )
+
+    service = AnalysisService(
+        workers=workers,
+        executor=args.executor,
+        chunksize=args.chunksize,
+        cache=AnalysisCache(max_size=args.cache_size),
+        max_batch=args.max_batch,
+        keep_alive_timeout=args.keep_alive,
+        admission=admission,
+        trust_client_id=args.trust_client_id
+    )
+
+    def ready(address):
+        sys.stderr.write(f"Serving on http://{address[0]}:{address[1]} ({service.workers} {args.executor} workers)\n")
+
+    try:
+        asyncio.run(serve(service, args.host, args.port, ready))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Precompiled HTML templates for the page's panels.
+
+Each panel is rendered into a single HTML fragment and sent with one
+st.markdown call instead of one call per line, so a check produces a handful
+of delta messages rather than dozens. Templates are compiled once at import:
+the whitespace used to lay them out here is stripped, so Markdown can't
+mistake indented lines for code blocks, and the result is a string.Template
+that reruns only substitute into. Substituted values are HTML-escaped.
+"""
+from html import escape
+from string import Template
+
+from gauge import gauge_html
+from utils import get_emoji_rating
+
+def _compile(markup):
+    """Strips layout whitespace from a template and parses it."""
+    return Template(''.join(line.strip() for line in markup.strip().splitlines()))
+
+def _level(value, medium, high):
+    """CSS level class for a value against medium and high thresholds."""
+    if value >= high:
+        return 'level-high'
+    return 'level-medium' if value >= medium else 'level-low'
+
+def _strength_class(score, prefix):
+    """Weak/medium/strong CSS class for a score, e.g. 'history-weak'."""
+    if score <= 1:
+        return f'{prefix}-weak'
+    return f'{prefix}-medium' if score <= 2 else f'{prefix}-strong'
+
+CHECK = _compile("""
+    <div class="check-item">
+        <span class="check-mark $state">[$icon]</span> <span class="check-label">$label</span>
+    </div>
+""")
+
+REALTIME_PANEL = _compile("""
+    <div class="real-time-header">Real-time Feedback:</div>
+    <div class="result-section">
+        <p><em>Length:</em></p>
+        <div class="level $length_level">$length_message</div>
+        <p><em>Character Types:</em></p>
+        <div class="check-grid">$checks</div>
+        <p><em>Overall Complexity:</em></p>
+        <div class="level $complexity_level">$complexity_message</div>
+    </div>
+""")
+
+CRITERION = _compile("""
+    <div class="criterion">
+        <span class="check-mark $state">[$icon]</span> <span class="criterion-name">$name:</span> <span class="criterion-message">$message</span>
+    </div>
+""")
+
+DETAILS_PANEL = _compile("""
+    <div class="result-section">
+        <div class="strength-header">Password Details</div>
+        $criteria
+    </div>
+""")
+
+RESULTS_PANEL = _compile("""
+    <div class="result-section">
+        $reuse_warning
+        $gauge
+        <h3>Estimated time to crack: <em>$crack_time</em></h3>
+        $approximate_note
+        <div class="strength-header">$title</div>
+        <p>$description</p>
+        <div class="fun-result $strength_class">$funny_comment</div>
+        $warning
+        $suggestions
+    </div>
+""")
+
+CONTEXT_PANEL = _compile("""
+    <div class="result-section">
+        <div class="strength-header">Security Context</div>
+        <h4>Key Recommendations:</h4>
+        <ol>$strategies</ol>
+    </div>
+""")
+
+HISTORY_ITEM = _compile("""
+    <div class="history-item $strength_class">
+        <strong>Date:</strong> $date<br>
+        <strong>Strength:</strong> $rating<br>
+        <strong>Crack time:</strong> $crack_time
+    </div>
+""")
+
+def _check(passed, label):
+    return CHECK.substitute(
+        state='pass' if passed else 'fail',
+        icon='✓' if passed else '✗',
+        label=escape(label)
+    )
+
+def _items(values, tag='li'):
+    return ''.join(f'<{tag}>{escape(value)}</{tag}>' for value in values)
+
+def realtime_panel(scan):
+    """
+    Renders the real-time feedback shown while typing.
+
+    Args:
+        scan (PasswordScan): Result of scan_password
+
+    Returns:
+        str: HTML fragment
+    """
+    length = scan.length
+    if length < 8:
+        length_message = f"Too short ({length} chars) - minimum 8 characters recommended"
+    elif length < 12:
+        length_message = f"Acceptable length ({length} chars) - 12+ characters is better"
+    else:
+        length_message = f"Good length ({length} chars)"
+
+    types = [
+        (scan.any_upper, "Uppercase letters"),
+        (scan.any_lower, "Lowercase letters"),
+        (scan.digits > 0, "Numbers"),
+        (scan.symbols > 0, "Special characters")
+    ]
+    complexity = sum(passed for passed, _ in types)
+    if complexity <= 2:
+        complexity_message = "Low complexity - add more character types"
+    elif complexity == 3:
+        complexity_message = "Medium complexity - good mix of characters"
+    else:
+        complexity_message = "High complexity - excellent character variety"
+
+    return REALTIME_PANEL.substitute(
+        length_level=_level(length, 8, 12),
+        length_message=length_message,
+        checks=''.join(_check(passed, label) for passed, label in types),
+        complexity_level=_level(complexity, 3, 4),
+        complexity_message=complexity_message
+    )
+
+def details_panel(strength_details):
+    """
+    Renders the pass/fail list of password criteria.
+
+    Args:
+        strength_details (dict): Criterion name to {'pass', 'message'}
+
+    Returns:
+        str: HTML fragment
+    """
+    criteria = ''.join(
+        CRITERION.substitute(
+            state='pass' if details['pass'] else 'fail',
+            icon='✓' if details['pass'] else '✗',
+            name=escape(criteria),
+            message=escape(details['message'])
+        )
+        for criteria, details in strength_details.items()
+    )
+    return DETAILS_PANEL.substitute(criteria=criteria)
+
+def results_panel(analysis, strength_desc, funny_comment, previously_used=False):
+    """
+    Renders the gauge, crack time, description and suggestions of a check.
+
+    Args:
+        analysis (dict): Result of analyze_password
+        strength_desc (dict): Title and content for the score
+        funny_comment (str): Comment matching the score
+        previously_used (bool): Whether to warn that the password was checked before
+
+    Returns:
+        str: HTML fragment
+    """
+    score = analysis['score']
+    reuse_warning = ''
+    if previously_used:
+        reuse_warning = ('<div class="warning">⚠ This password has been checked before! '
+                         'Using the same password for multiple accounts is not recommended.</div>')
+    approximate_note = ''
+    if analysis.get('approximate'):
+        approximate_note = ('<p class="caption">Very long password: this estimate is approximate, '
+                            'based on a time-limited analysis.</p>')
+    warning = f'<div class="warning">⚠ {escape(analysis["warnings"])}</div>' if analysis['warnings'] else ''
+    suggestions = ''
+    if analysis['suggestions']:
+        suggestions = f'<h3>Improvement suggestions:</h3><ul>{_items(analysis["suggestions"])}</ul>'
+
+    return RESULTS_PANEL.substitute(
+        reuse_warning=reuse_warning,
+        gauge=gauge_html(score),
+        crack_time=escape(analysis['crack_time_display']),
+        approximate_note=approximate_note,
+        title=escape(strength_desc['title']),
+        description=escape(strength_desc['content']),
+        strength_class=_strength_class(score, 'strength'),
+        funny_comment=escape(funny_comment),
+        warning=warning,
+        suggestions=suggestions
+    )
+
+def context_panel(strategies):
+    """
+    Renders the top security recommendations for a check.
+
+    Args:
+        strategies (list): Recommendations, most important first
+
+    Returns:
+        str: HTML fragment
+    """
+    return CONTEXT_PANEL.substitute(strategies=_items(strategies))
+
+def history_panel(items):
+    """
+    Renders recent checks for the sidebar history.
+
+    Args:
+        items (list): History entries with date, score and crack_time
+
+    Returns:
+        str: HTML fragment
+    """
+    return ''.join(
+        HISTORY_ITEM.substitute(
+            strength_class=_strength_class(item["score"], 'history'),
+            date=escape(str(item["date"])),
+            rating=get_emoji_rating(item["score"]),
+            crack_time=escape(str(item["crack_time"]))
+        )
+        for item in items
+    )